@@ -0,0 +1,82 @@
+"""도구 호출 1회당 디스패치 오버헤드를 비교합니다.
+
+    python benchmarks/bench_dispatch.py --calls 500
+
+비교 대상:
+    per-call: 호출마다 asyncio.run + Client(proxy) 세션 생성 (이전 방식)
+    proxy:    장수명 세션 + FastMCP.as_proxy
+    direct:   같은 프로세스의 도구를 직접 호출
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastmcp import Client, FastMCP  # noqa: E402
+
+import newsletter_client  # noqa: E402
+from newsletter_server import app as mcp_app  # noqa: E402
+
+TOOL = "create_newsletter_html"
+ARGS = {"title": "벤치마크", "news_content": "📰 제목\n🔗 https://example.com\n📝 요약", "intro_text": "안녕하세요"}
+
+
+def _summarize(label: str, samples: list[float]) -> None:
+    samples.sort()
+    p50 = statistics.median(samples) * 1e6
+    p95 = samples[int(len(samples) * 0.95) - 1] * 1e6
+    print(f"{label:<10} n={len(samples):<5} p50={p50:9.1f}µs  p95={p95:9.1f}µs  mean={statistics.fmean(samples) * 1e6:9.1f}µs")
+
+
+def bench_per_call(calls: int) -> list[float]:
+    proxy = FastMCP.as_proxy(mcp_app)
+
+    async def _invoke() -> None:
+        async with Client(proxy) as client:
+            await client.call_tool(TOOL, ARGS)
+
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        asyncio.run(_invoke())
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_dispatcher(mode: str, calls: int) -> list[float]:
+    dispatcher = newsletter_client.create_dispatcher(mode)
+
+    async def _run() -> list[float]:
+        await dispatcher.call_tool(TOOL, ARGS)  # 연결/캐시 워밍업
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await dispatcher.call_tool(TOOL, ARGS)
+            samples.append(time.perf_counter() - start)
+        await dispatcher.aclose()
+        return samples
+
+    return asyncio.run(_run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MCP 디스패치 오버헤드 벤치마크")
+    parser.add_argument("--calls", type=int, default=200, help="모드별 호출 횟수")
+    parser.add_argument("--skip-per-call", action="store_true", help="이전 방식(per-call) 측정을 건너뜀")
+    args = parser.parse_args()
+
+    if not args.skip_per_call:
+        _summarize("per-call", bench_per_call(max(1, args.calls // 10)))
+    _summarize("proxy", bench_dispatcher("proxy", args.calls))
+    _summarize("direct", bench_dispatcher("direct", args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""로컬 픽스처 서버로 원문 본문 추출 단계의 소요 시간을 측정합니다.
+
+    python benchmarks/bench_extract.py --hosts 4 --pages 8 --delay 0.3
+
+루프백 주소 ``127.0.0.1``~``127.0.0.N``을 서로 다른 호스트로 삼아 호스트마다
+``--pages``개의 기사 페이지를 ``--delay``초 늦게 제공합니다. 한 번에 하나씩
+받는 순차 추출과 ``extract_articles``의 호스트별 제한 동시 추출을 비교하고,
+호스트별 최대 동시 요청 수가 ``--per-host``를 넘지 않았는지 출력합니다.
+마지막으로 캐시를 채운 뒤 다시 실행해 요청 수를 비교합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from newsletter_article import Article  # noqa: E402
+from newsletter_extract import HostThrottle, PageTextCache, extract_articles  # noqa: E402
+
+PAGE = """<!DOCTYPE html><html><head><meta charset="utf-8">
+<meta property="og:description" content="Story {page} summary"><title>Story {page}</title></head>
+<body><nav><a href="/">Home</a> <a href="/ai">AI</a></nav>
+<header><p>Subscribe to our newsletter for the latest stories every morning.</p></header>
+<article><h1>Story {page} on host {host}</h1>
+<p>Paragraph one of story {page} explains what happened and why it matters for the industry.</p>
+<p>Paragraph two adds context: funding, competitors, and what regulators said this week.</p>
+<p>Paragraph three quotes an analyst who expects the change to reach customers within months.</p>
+</article><aside><p>Related: ten other stories you might have missed this week in AI news.</p></aside>
+<footer><p>Copyright Example Media. All rights reserved.</p></footer></body></html>"""
+
+
+class FixtureStats:
+    requests = 0
+    active: Counter[str] = Counter()
+    peak: Counter[str] = Counter()
+
+
+def start_fixture_server(delay: float) -> ThreadingHTTPServer:
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            host = self.headers.get("Host", "").split(":")[0]
+            with lock:
+                FixtureStats.requests += 1
+                FixtureStats.active[host] += 1
+                FixtureStats.peak[host] = max(FixtureStats.peak[host], FixtureStats.active[host])
+            try:
+                time.sleep(delay)
+                body = PAGE.format(page=self.path.strip("/"), host=host).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with lock:
+                    FixtureStats.active[host] -= 1
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_articles(port: int, hosts: int, pages: int) -> list[Article]:
+    return [
+        Article(f"Story {page}", f"http://127.0.0.{host + 1}:{port}/{page}", source=f"host{host}")
+        for host in range(hosts)
+        for page in range(pages)
+    ]
+
+
+def run(label: str, articles: list[Article], **kwargs: object) -> None:
+    FixtureStats.requests = 0
+    FixtureStats.peak.clear()
+    start = time.perf_counter()
+    errors = extract_articles(articles, **kwargs)
+    elapsed = time.perf_counter() - start
+    filled = sum(1 for article in articles if article.body)
+    peak = max(FixtureStats.peak.values(), default=0)
+    print(
+        f"{label:<11} {elapsed:7.2f}s  extracted={filled}/{len(articles)} errors={len(errors)} "
+        f"requests={FixtureStats.requests} peak_per_host={peak}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="원문 본문 추출 벤치마크")
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.3, help="페이지 응답 지연(초)")
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--host-delay", type=float, default=0.05, help="호스트별 요청 시작 간격(초)")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.delay)
+    port = server.server_address[1]
+
+    run(
+        "sequential",
+        make_articles(port, args.hosts, args.pages),
+        max_workers=1,
+        throttle=HostThrottle(per_host=1, delay=0),
+        cache=None,
+    )
+    run(
+        "pooled",
+        make_articles(port, args.hosts, args.pages),
+        max_workers=args.workers,
+        throttle=HostThrottle(args.per_host, args.host_delay),
+        cache=None,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PageTextCache(Path(tmp))
+        for label in ("cold-cache", "warm-cache"):
+            articles = make_articles(port, args.hosts, args.pages)
+            run(
+                label,
+                articles,
+                max_workers=args.workers,
+                throttle=HostThrottle(args.per_host, args.host_delay),
+                cache=cache,
+            )
+        print("sample:", articles[0].body.replace("\n", " | ")[:160])
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
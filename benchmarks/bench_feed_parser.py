@@ -0,0 +1,82 @@
+"""수 MB 크기의 피드에서 앞쪽 N개 항목만 필요할 때의 파싱 비용을 비교합니다.
+
+    python benchmarks/bench_feed_parser.py --items 5000 --count 5
+
+비교 대상:
+    tree:      ET.fromstring으로 전체 트리를 만든 뒤 findall('.//item')[:count] (이전 방식)
+    streaming: newsletter_feeds.iter_feed_items로 조각 단위 파싱 후 count개에서 중단
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from newsletter_feeds import STREAM_CHUNK_SIZE, iter_feed_items  # noqa: E402
+
+
+def make_feed(items: int, description_chars: int) -> bytes:
+    filler = "&lt;p&gt;" + ("lorem ipsum dolor sit amet " * (description_chars // 27 + 1))[:description_chars] + "&lt;/p&gt;"
+    body = "".join(
+        f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+        f"<description>{filler}</description>"
+        f"<pubDate>Mon, 06 Jan 2025 10:{i % 60:02d}:00 +0000</pubDate></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>{body}</channel></rss>'.encode()
+
+
+def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def measure(label: str, fn, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} best={best * 1000:9.2f} ms  peak_mem={peak / 1024 / 1024:7.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="피드 파서 벤치마크")
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--description-chars", type=int, default=600)
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    document = make_feed(args.items, args.description_chars)
+    print(f"document: {len(document) / 1024 / 1024:.2f} MiB, {args.items} items, count={args.count}")
+
+    def tree() -> None:
+        root = ET.fromstring(document)
+        root.findall(".//item")[:args.count]
+
+    def streaming() -> None:
+        list(islice(iter_feed_items(chunked(document, STREAM_CHUNK_SIZE), "bench"), args.count))
+
+    def streaming_full() -> None:
+        for _ in iter_feed_items(chunked(document, STREAM_CHUNK_SIZE), "bench"):
+            pass
+
+    measure("tree", tree, args.repeat)
+    measure("streaming", streaming, args.repeat)
+    measure("stream-all", streaming_full, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
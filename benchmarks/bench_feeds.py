@@ -0,0 +1,119 @@
+"""로컬 픽스처 HTTP 서버로 다중 피드 수집 시간을 측정합니다.
+
+    python benchmarks/bench_feeds.py --feeds 30 --delay 0.3
+
+피드마다 ``--delay``초 늦게 응답하는 RSS 문서를 제공하고, 순차 수집과
+``fetch_feeds``의 동시 수집 소요 시간을 비교합니다. 마지막으로 ETag 조건부
+GET 캐시를 채운 뒤 다시 수집해 304 응답으로 전송된 바이트를 비교합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import newsletter_feeds  # noqa: E402
+from newsletter_feeds import Feed  # noqa: E402
+
+
+def make_rss(feed_index: int, items: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    entries = "".join(
+        f"<item><title>Feed {feed_index} story {i}</title>"
+        f"<link>https://example.com/{feed_index}/{i}</link>"
+        f"<description>&lt;p&gt;Story {i} from feed {feed_index}&lt;/p&gt;</description>"
+        f"<pubDate>{format_datetime(now - timedelta(minutes=feed_index + i * 7))}</pubDate></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {feed_index}</title>{entries}</channel></rss>'.encode()
+
+
+class FixtureStats:
+    body_bytes = 0
+    not_modified = 0
+
+
+def start_fixture_server(feeds: int, items: int, delay: float) -> ThreadingHTTPServer:
+    documents = {f"/feed/{i}": make_rss(i, items) for i in range(feeds)}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = documents.get(self.path)
+            time.sleep(delay)
+            if body is None:
+                self.send_error(404)
+                return
+            etag = f'"{hash(body) & 0xFFFFFFFF:08x}"'
+            if self.headers.get("If-None-Match") == etag:
+                with lock:
+                    FixtureStats.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            with lock:
+                FixtureStats.body_bytes += len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="다중 피드 수집 벤치마크")
+    parser.add_argument("--feeds", type=int, default=30)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.3, help="피드별 응답 지연(초)")
+    parser.add_argument("--count", type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.feeds, args.items, args.delay)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    feeds = [Feed(f"feed-{i}", f"{base}/feed/{i}") for i in range(args.feeds)]
+
+    start = time.perf_counter()
+    sequential = []
+    for feed in feeds:
+        sequential.extend(newsletter_feeds.fetch_feed(feed, args.count, cache=None))
+    print(f"sequential  {time.perf_counter() - start:7.2f}s  items={len(sequential)}")
+
+    start = time.perf_counter()
+    items, errors = newsletter_feeds.fetch_feeds(feeds, args.count, cache=None, breaker=None)
+    print(f"concurrent  {time.perf_counter() - start:7.2f}s  items={len(items)} errors={len(errors)}")
+    print("newest:", items[0].title if items else "-")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = newsletter_feeds.FeedHTTPCache(Path(tmp))
+        for label in ("cold-cache", "warm-cache"):
+            FixtureStats.body_bytes = FixtureStats.not_modified = 0
+            start = time.perf_counter()
+            items, errors = newsletter_feeds.fetch_feeds(feeds, args.count, cache=cache, breaker=None)
+            print(
+                f"{label:<11} {time.perf_counter() - start:7.2f}s  items={len(items)} "
+                f"body_bytes={FixtureStats.body_bytes} not_modified={FixtureStats.not_modified}"
+            )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""후보 기사 사전 순위 계산 비용을 비교합니다.
+
+    python benchmarks/bench_rank.py --candidates 5000 --top 5
+
+비교 대상:
+    python-loop: 기사마다 dict로 TF-IDF 벡터를 만들고 점수를 계산하는 순수 파이썬 구현
+    vectorized:  newsletter_rank.rank_articles (0이 아닌 항목 배열 위의 numpy 계산)
+
+두 구현의 상위 ``--top``개가 같은지도 확인합니다. 순위가 LLM에 넘기는 후보 수를
+줄이므로, 출력의 ``prompt_chars``는 후보 전체를 넘길 때와 상위만 넘길 때의
+요약 글자 수를 비교합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from newsletter_article import Article  # noqa: E402
+from newsletter_rank import (  # noqa: E402
+    RANK_HALF_LIFE_HOURS,
+    RANK_TOPICS,
+    RANK_WEIGHTS,
+    TITLE_BOOST,
+    _topic_terms,
+    rank_articles,
+    tokenize,
+)
+
+WORDS = (
+    "OpenAI Anthropic model startup funding chips inference training regulators Europe developers "
+    "open-source benchmark latency agents robotics data center GPU bakery football election weather "
+    "recipe travel music film fashion housing market"
+).split()
+SOURCES = ["techcrunch", "verge", "wired", "arstechnica", "zdnet"]
+
+
+def make_articles(count: int, now: datetime) -> list[Article]:
+    rng = random.Random(11)
+    articles = []
+    for i in range(count):
+        article = Article(
+            title=" ".join(rng.choices(WORDS, k=rng.randint(5, 10))),
+            link=f"https://example.com/{i}",
+            summary=" ".join(rng.choices(WORDS, k=rng.randint(30, 60))),
+            published=now - timedelta(minutes=rng.randint(0, 7 * 24 * 60)),
+            source=rng.choice(SOURCES),
+        )
+        for _ in range(rng.choice((0, 0, 0, 1, 2))):
+            article.sources.append({"source": rng.choice(SOURCES), "link": f"https://mirror.example.com/{i}"})
+        articles.append(article)
+    return articles
+
+
+def python_loop(articles: list[Article], source_weights: dict[str, float], now: datetime) -> list[Article]:
+    docs = []
+    for article in articles:
+        terms = Counter(tokenize(article.title) * TITLE_BOOST)
+        terms.update(tokenize(article.summary))
+        docs.append(terms)
+    df: Counter[str] = Counter()
+    for terms in docs:
+        df.update(terms.keys())
+    n = len(articles)
+    idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+    query = {term: idf[term] for term in _topic_terms(RANK_TOPICS) if term in idf}
+    query_norm = math.sqrt(sum(w * w for w in query.values()))
+
+    relevance, source, coverage, recency = [], [], [], []
+    for article, terms in zip(articles, docs):
+        vector = {term: (1 + math.log(count)) * idf[term] for term, count in terms.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        dot = sum(w * query.get(term, 0.0) for term, w in vector.items())
+        relevance.append(dot / (norm * query_norm) if norm and query_norm else 0.0)
+        source.append(max(source_weights.get(s["source"], 1.0) for s in article.sources))
+        coverage.append(math.log1p(len(article.sources)))
+        age = max(0.0, (now - article.published).total_seconds() / 3600)
+        recency.append(2 ** (-age / RANK_HALF_LIFE_HOURS))
+
+    def scaled(values: list[float]) -> list[float]:
+        peak = max(values)
+        return [v / peak if peak > 0 else 0.0 for v in values]
+
+    relevance, source, coverage = scaled(relevance), scaled(source), scaled(coverage)
+    for i, article in enumerate(articles):
+        article.score = round(
+            RANK_WEIGHTS["recency"] * recency[i]
+            + RANK_WEIGHTS["relevance"] * relevance[i]
+            + RANK_WEIGHTS["source"] * source[i]
+            + RANK_WEIGHTS["coverage"] * coverage[i],
+            6,
+        )
+    return sorted(articles, key=lambda a: (-a.score, -a.published.timestamp(), a.hash))
+
+
+def measure(label: str, fn, repeat: int) -> list[Article]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ranked = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<12} best={best * 1000:9.2f} ms")
+    return ranked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="사전 순위 벤치마크")
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    articles = make_articles(args.candidates, now)
+    weights = {"techcrunch": 1.2, "verge": 1.0, "wired": 1.1}
+
+    loop = measure("python-loop", lambda: python_loop(articles, weights, now), args.repeat)
+    vectorized = measure("vectorized", lambda: rank_articles(articles, source_weights=weights, now=now), args.repeat)
+    same = [a.link for a in loop[: args.top]] == [a.link for a in vectorized[: args.top]]
+    print(f"same top-{args.top}: {same}")
+    print(
+        f"prompt_chars all={sum(len(a.summary) for a in articles)} "
+        f"top={sum(len(a.summary) for a in vectorized[: args.top])}"
+    )
+    for article in vectorized[: args.top]:
+        print(f"  {article.score:.3f}  {article.title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""피드 요약 HTML 정리 비용을 비교합니다.
+
+    python benchmarks/bench_sanitize.py --count 5000
+    python benchmarks/bench_sanitize.py --feeds .newsletter_cache/feeds/*.body
+
+``--feeds``로 실제 피드 문서(RSS/Atom/JSON Feed, 예: 피드 캐시의 ``*.body``)를
+넘기면 그 요약들을, 없으면 WordPress 피드 형태를 흉내 낸 요약을 ``--count``개가
+될 때까지 반복해 사용합니다.
+
+비교 대상:
+    regex-slice: 항목마다 ``re.sub(r'<[^>]+>', '', description)[:200] + "..."`` (이전 방식)
+    sanitizer:   newsletter_text.summarize_html (태그/엔티티/공백 처리, 단어 경계 자르기)
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from newsletter_feeds import parse_feed  # noqa: E402
+from newsletter_text import summarize_html  # noqa: E402
+
+WORDS = (
+    "OpenAI Anthropic model startup funding chips inference training regulators Europe "
+    "developers open-source benchmark latency agents robotics data center GPU"
+).split()
+
+
+def synthetic_description(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(2, 6)):
+        words = rng.choices(WORDS, k=rng.randint(8, 20))
+        if rng.random() < 0.5:
+            i = rng.randrange(len(words))
+            words[i] = f'<a href="https://example.com/{rng.randint(1, 999)}">{words[i]}</a>'
+        if rng.random() < 0.3:
+            words.append("company&#8217;s")
+        sentences.append(" ".join(words) + ".")
+    image = '<img src="https://example.com/i.jpg" width="1200" height="800" />' if rng.random() < 0.4 else ""
+    return (
+        f"{image}<p>{' '.join(sentences)}&nbsp;[&hellip;]</p>\n"
+        f"<p>The post <a href=\"https://example.com\">Story</a> appeared first on Example &amp; Co.</p>"
+    )
+
+
+def load_descriptions(paths: list[str], count: int) -> list[str]:
+    descriptions = []
+    for path in paths:
+        descriptions.extend(item.summary for item in parse_feed(Path(path).read_bytes(), path, 10_000))
+    if not descriptions:
+        rng = random.Random(7)
+        descriptions = [synthetic_description(rng) for _ in range(500)]
+    return (descriptions * (count // len(descriptions) + 1))[:count]
+
+
+def regex_slice(descriptions: list[str]) -> list[str]:
+    out = []
+    for description in descriptions:
+        import re
+
+        out.append(re.sub(r'<[^>]+>', '', description)[:200] + "...")
+    return out
+
+
+def sanitizer(descriptions: list[str]) -> list[str]:
+    return [summarize_html(description, 200) for description in descriptions]
+
+
+def measure(label: str, fn, descriptions: list[str], repeat: int) -> list[str]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(descriptions)
+        best = min(best, time.perf_counter() - start)
+    leftovers = sum(1 for text in out if "&" in text and ";" in text or "\n" in text or "  " in text)
+    print(
+        f"{label:<12} best={best * 1000:8.2f} ms  per_item={best / len(descriptions) * 1e6:6.2f} us  "
+        f"unclean={leftovers}/{len(out)}"
+    )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="요약 HTML 정리 벤치마크")
+    parser.add_argument("--feeds", nargs="*", default=[], help="요약을 읽을 피드 문서 파일")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    descriptions = load_descriptions(args.feeds, args.count)
+    total = sum(len(d) for d in descriptions)
+    print(f"descriptions={len(descriptions)} avg_chars={total // len(descriptions)}")
+    before = measure("regex-slice", regex_slice, descriptions, args.repeat)
+    after = measure("sanitizer", sanitizer, descriptions, args.repeat)
+    print("before:", before[0])
+    print("after: ", after[0])
+
+
+if __name__ == "__main__":
+    main()
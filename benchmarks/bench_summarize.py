@@ -0,0 +1,68 @@
+"""기사별 요약(map) 단계의 순차 실행과 병렬 실행 소요 시간을 비교합니다.
+
+    python benchmarks/bench_summarize.py --articles 5 --latency 2.0 --jitter 1.0
+
+실제 LLM 대신 ``--latency`` ± ``--jitter``초 뒤에 응답하는 가짜 LLM을 씁니다.
+편집 에이전트 한 턴이 기사들을 차례로 처리하는 경우(``sequential``)와
+``summarize_articles``가 ``--concurrency``개씩 동시에 처리하는 경우(``fanout``)를
+비교합니다. 병렬 실행은 가장 느린 기사 하나에 가까운 시간이 걸려야 합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from newsletter_summarize import SelectedArticle, compose_intro, summarize_articles  # noqa: E402
+
+
+class FakeLLM:
+    def __init__(self, latency: float, jitter: float, seed: int = 7) -> None:
+        self._delays: dict[str, float] = {}
+        self._rng = random.Random(seed)
+        self.latency = latency
+        self.jitter = jitter
+
+    def delay(self, prompt: str) -> float:
+        # 같은 기사는 두 실행에서 같은 지연을 갖도록 프롬프트별로 고정합니다.
+        if prompt not in self._delays:
+            self._delays[prompt] = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        return self._delays[prompt]
+
+    def call(self, messages: list[dict[str, str]]) -> str:
+        time.sleep(self.delay(messages[-1]["content"]))
+        return "한국어 제목\n핵심 내용 요약입니다. 독자에게 주는 의미입니다."
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="기사별 병렬 요약 벤치마크")
+    parser.add_argument("--articles", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=2.0, help="가짜 LLM 평균 응답 시간(초)")
+    parser.add_argument("--jitter", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    llm = FakeLLM(args.latency, args.jitter)
+    articles = [
+        SelectedArticle(title=f"Story {i}", link=f"https://example.com/{i}", summary=f"<p>Summary of story {i}.</p>")
+        for i in range(args.articles)
+    ]
+
+    for label, concurrency in (("sequential", 1), ("fanout", args.concurrency)):
+        start = time.perf_counter()
+        stories = summarize_articles(llm, articles, max_concurrency=concurrency, timeout=args.timeout)
+        compose_intro(llm, stories)
+        elapsed = time.perf_counter() - start
+        slowest = max(story.seconds for story in stories)
+        failed = sum(1 for story in stories if story.error)
+        print(f"{label:<11} {elapsed:6.2f}s  slowest_article={slowest:.2f}s failed={failed}")
+
+
+if __name__ == "__main__":
+    main()
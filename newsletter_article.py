@@ -0,0 +1,96 @@
+"""Normalized article record shared by every stage of the news pipeline.
+
+RSS 2.0, Atom, JSON Feed 어느 형식에서 읽었든 기사는 ``Article`` 하나로
+표현되며, 수집 → 중복 제거 → 저장 → 렌더링까지 같은 객체가 전달됩니다.
+``__slots__``를 사용해 인스턴스마다 ``__dict__``를 두지 않으므로 수천 건을
+메모리에 올려도 가볍습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime
+from typing import Any
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def content_hash(title: str, summary: str) -> str:
+    """태그, 대소문자, 공백 차이를 무시한 제목+요약의 해시."""
+    text = _SPACE_RE.sub(" ", _TAG_RE.sub(" ", f"{title}\n{summary}")).strip().lower()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class Article:
+    """정규화된 기사 한 건.
+
+    Attributes:
+        title: 제목
+        link: 원문 URL
+        summary: 피드에 실린 요약 (HTML이 섞여 있을 수 있음)
+        published: 발행 시각 (시간대 포함) 또는 None
+        source: 피드 이름
+        hash: 제목+요약의 내용 해시
+        sources: 같은 이야기로 묶인 보도들의 ``{"source", "link"}`` 목록
+        signature: 중복 탐지용 MinHash 서명 (계산 전에는 None)
+        body: 원문 페이지에서 추출한 본문 (추출하지 않았으면 빈 문자열)
+        stale: 피드 요청이 실패해 캐시에 남은 이전 항목을 대신 쓴 경우 True
+        score: 사전 순위 점수 (``newsletter_rank``, 계산 전에는 None)
+    """
+
+    __slots__ = ("title", "link", "summary", "published", "source", "hash", "sources", "signature", "body", "stale", "score")
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        summary: str = "",
+        published: datetime | None = None,
+        source: str = "",
+        hash: str | None = None,
+    ) -> None:
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        self.source = source
+        self.hash = hash or content_hash(title, summary)
+        self.sources: list[dict[str, str]] = [{"source": source, "link": link}]
+        self.signature: tuple[int, ...] | None = None
+        self.body = ""
+        self.stale = False
+        self.score: float | None = None
+
+    def __repr__(self) -> str:
+        return f"Article(title={self.title!r}, source={self.source!r}, link={self.link!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON으로 직렬화할 수 있는 dict (서명은 제외)."""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "summary": self.summary,
+            "published": self.published.isoformat() if self.published else None,
+            "source": self.source,
+            "hash": self.hash,
+            "sources": self.sources,
+            "body": self.body,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Article:
+        published = data.get("published")
+        article = cls(
+            title=data["title"],
+            link=data.get("link", ""),
+            summary=data.get("summary", ""),
+            published=datetime.fromisoformat(published) if published else None,
+            source=data.get("source", ""),
+            hash=data.get("hash"),
+        )
+        if data.get("sources"):
+            article.sources = list(data["sources"])
+        article.body = data.get("body") or ""
+        return article
@@ -0,0 +1,132 @@
+"""Content-addressed store for large tool outputs passed between tasks by reference.
+
+수 KB짜리 HTML 뉴스레터가 태스크 컨텍스트와 도구 인자로 LLM을 두 번 거치면
+토큰이 그만큼 들고 모델이 HTML을 줄이거나 고칠 수 있습니다. 대신 도구는 본문을
+이 저장소에 넣고 핸들(id, 크기, sha256)만 LLM에 돌려주며, 다음 도구가 핸들을
+받아 본문을 꺼냅니다.
+
+본문은 ``NEWSLETTER_CACHE_DIR/artifacts``(또는 ``ARTIFACT_DIR``)에 sha256으로
+저장되므로 같은 내용은 한 번만 저장되고, 프로세스를 다시 시작해도 핸들이
+유효합니다. 꺼낼 때 해시를 다시 확인해 손상된 본문은 쓰지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from newsletter_feeds import CACHE_DIR
+
+# LLM에 보여 주는 참조 형식: "artifact:" + sha256 앞 16자리
+_REF_RE = re.compile(r"artifact:([0-9a-f]{16})")
+
+
+@dataclass(frozen=True)
+class Artifact:
+    id: str
+    media_type: str
+    size: int
+    sha256: str
+
+    @property
+    def ref(self) -> str:
+        return f"artifact:{self.id}"
+
+    def handle(self) -> str:
+        """LLM에 돌려줄 간결한 JSON 핸들."""
+        return json.dumps(
+            {"artifact": self.ref, "media_type": self.media_type, "size": self.size, "sha256": self.sha256},
+            separators=(",", ":"),
+        )
+
+
+def find_ref(text: Any) -> str | None:
+    """앞뒤 공백을 뺀 문자열이 ``artifact:<id>`` 참조나 ``Artifact.handle()`` JSON 그대로면 id를 반환합니다.
+
+    참조를 언급하는 일반 본문(예: "artifact:… 를 첨부합니다")은 참조로 보지 않습니다.
+    """
+    if not isinstance(text, str):
+        return None
+    text = text.strip()
+    if text.startswith("{"):
+        try:
+            handle = json.loads(text)
+        except ValueError:
+            return None
+        text = handle.get("artifact") if isinstance(handle, dict) else None
+        if not isinstance(text, str):
+            return None
+    match = _REF_RE.fullmatch(text)
+    return match.group(1) if match else None
+
+
+def mentions_ref(text: Any) -> bool:
+    """``find_ref``가 참조로 보지 않더라도 문자열 안에 ``artifact:<id>``가 들어 있으면 True."""
+    return isinstance(text, str) and _REF_RE.search(text) is not None
+
+
+class ArtifactStore:
+    """sha256 주소로 본문을 저장합니다. ``directory``가 None이면 메모리에만 둡니다."""
+
+    def __init__(self, directory: Path | None) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._memory: dict[str, tuple[Artifact, str]] = {}
+
+    def _path(self, artifact_id: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{artifact_id}.json"
+
+    def put(self, content: str, media_type: str = "text/html") -> Artifact:
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        artifact = Artifact(id=digest[:16], media_type=media_type, size=len(data), sha256=digest)
+        with self._lock:
+            self._memory[artifact.id] = (artifact, content)
+        if self.directory is not None:
+            path = self._path(artifact.id)
+            if not path.exists():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(
+                    json.dumps({"media_type": media_type, "sha256": digest, "content": content}, ensure_ascii=False),
+                    encoding="utf-8",
+                )
+                os.replace(tmp, path)
+        return artifact
+
+    def get(self, artifact_id: str) -> str:
+        """본문을 꺼냅니다. 없으면 ``KeyError``, 해시가 맞지 않으면 ``ValueError``입니다."""
+        with self._lock:
+            entry = self._memory.get(artifact_id)
+        if entry is not None:
+            return entry[1]
+        try:
+            stored = json.loads(self._path(artifact_id).read_text(encoding="utf-8")) if self.directory else None
+        except (OSError, ValueError):
+            stored = None
+        if stored is None:
+            raise KeyError(f"알 수 없는 artifact입니다: artifact:{artifact_id}")
+        content = stored["content"]
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != stored.get("sha256") or not digest.startswith(artifact_id):
+            raise ValueError(f"artifact 내용이 손상되었습니다: artifact:{artifact_id}")
+        artifact = Artifact(id=artifact_id, media_type=stored.get("media_type", ""), size=len(data), sha256=digest)
+        with self._lock:
+            self._memory[artifact_id] = (artifact, content)
+        return content
+
+    def resolve(self, text: str) -> str:
+        """``text``가 참조나 핸들 그대로면 저장된 본문을, 아니면 ``text``를 그대로 돌려줍니다."""
+        artifact_id = find_ref(text)
+        return self.get(artifact_id) if artifact_id else text
+
+
+ARTIFACTS = ArtifactStore(Path(os.getenv("ARTIFACT_DIR") or CACHE_DIR / "artifacts"))
@@ -0,0 +1,699 @@
+"""MCP client layer shared by the CrewAI tool wrappers.
+
+도구 호출마다 이벤트 루프와 MCP 세션을 새로 만드는 대신, 전용 백그라운드
+스레드에서 돌아가는 이벤트 루프 하나와 장수명 디스패처 하나를 모든 도구
+래퍼가 공유합니다.
+
+디스패치 모드 (환경 변수 ``MCP_DISPATCH``):
+    direct: 같은 프로세스의 ``newsletter_server.app`` 도구를 직접 호출
+        (``MCP_SERVER_URL``이 없을 때의 기본값)
+    proxy: ``FastMCP.as_proxy``를 거쳐 MCP 메시지로 호출
+    remote: ``MCP_SERVER_URL``에서 실행 중인 HTTP MCP 서버를 호출
+        (``MCP_SERVER_URL``이 있을 때의 기본값). 이 모드에서는
+        ``newsletter_server``를 import하지 않습니다.
+
+결과 인코딩 (환경 변수 ``MCP_RESULT_ENCODING`` 또는 호출별 ``encoding`` 인자):
+    compact: 공백 없는 JSON, 단일 문자열 결과는 그대로 (기본값)
+    pretty: 들여쓰기 JSON (이전 방식)
+    structured: structured_content를 파이썬 객체로 그대로 반환 (LLM이 아닌
+        코드가 결과를 소비할 때 호출별로 지정)
+
+``MCP_RESULT_MAX_CHARS``가 0보다 크면 문자열 결과를 그 길이로 자르고
+잘린 분량을 표시합니다. ``PAYLOAD_STATS``는 LLM에 넘어가는 문자열만 셉니다.
+structured 결과를 가공해 LLM에 넘기는 쪽은 ``account_payload``로 자르고 기록합니다.
+
+``CACHE_TTLS``에 등록된 도구의 결과는 (도구 이름, 정규화된 인자) 단위로
+TTL 동안 캐시합니다. ``MCP_CACHE=0``으로 끄거나 호출별로 ``cache=False``를
+넘겨 우회할 수 있습니다.
+
+``set_tape``로 기록기(``newsletter_llm_cache.CompletionCache``)를 지정하면
+인코딩된 도구 결과를 기록하고, replay 모드에서는 디스패처 대신 기록을 돌려줍니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Coroutine, TypeVar
+
+from newsletter_metrics import METRICS
+
+if TYPE_CHECKING:
+    import httpx
+    from fastmcp import Client, FastMCP
+
+# fastmcp/httpx는 무거우므로 디스패처를 처음 만들 때 불러옵니다.
+
+T = TypeVar("T")
+
+DISPATCH_MODES = ("direct", "proxy", "remote")
+# 재시도하면 부작용이 중복될 수 있는 도구 (연결 단계 실패만 재시도합니다)
+NON_IDEMPOTENT_TOOLS = frozenset({"send_email"})
+# 상태를 바꾸는 도구 (결과를 캐시하거나 기록에서 꺼내 쓰지 않습니다)
+SIDE_EFFECT_TOOLS = NON_IDEMPOTENT_TOOLS | {"mark_seen"}
+# 도구별 결과 캐시 TTL(초). 등록되지 않은 도구는 캐시하지 않습니다.
+CACHE_TTLS: dict[str, float] = {
+    "fetch_tech_news": 300.0,
+    "create_newsletter_html": 3600.0,
+}
+# CACHE_TTLS에 추가하더라도 절대 캐시하지 않는 도구
+UNCACHEABLE_TOOLS = SIDE_EFFECT_TOOLS | {"batch_call"}
+RESULT_ENCODINGS = ("compact", "pretty", "structured")
+TRUNCATION_MARKER = "\n…[{omitted}자 생략됨]"
+
+
+def is_idempotent(tool_name: str, arguments: dict[str, Any]) -> bool:
+    """재시도해도 부작용이 중복되지 않는 호출인지 확인합니다.
+
+    ``batch_call``은 항목 중 하나라도 ``NON_IDEMPOTENT_TOOLS``이면 재시도하지 않습니다.
+    """
+    if tool_name in NON_IDEMPOTENT_TOOLS:
+        return False
+    if tool_name == "batch_call":
+        return not any(
+            (call.get("tool") if isinstance(call, dict) else getattr(call, "tool", None)) in NON_IDEMPOTENT_TOOLS
+            for call in arguments.get("calls") or []
+        )
+    return True
+
+
+class BackgroundLoop:
+    """전용 데몬 스레드에서 asyncio 이벤트 루프를 실행합니다."""
+
+    def __init__(self, name: str = "mcp-client-loop") -> None:
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """실행 중인 루프를 반환합니다. 아직 없으면 스레드를 띄웁니다."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_forever, args=(loop,), name=self._name, daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """코루틴을 백그라운드 루프에 예약하고 concurrent Future를 반환합니다."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """코루틴을 백그라운드 루프에서 실행하고 결과를 기다립니다."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("백그라운드 루프 스레드 안에서는 동기 호출을 할 수 없습니다.")
+        return self.submit(coro).result(timeout)
+
+    def stop(self) -> None:
+        """루프를 멈추고 스레드를 정리합니다."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+
+class MCPSession:
+    """하나의 MCP 클라이언트 연결을 열어 두고 여러 호출이 공유하게 합니다.
+
+    연결은 백그라운드 루프 위의 태스크가 ``async with Client(...)`` 블록을
+    붙잡고 있는 방식으로 유지되므로, 진입과 종료가 항상 같은 태스크에서
+    일어납니다.
+    """
+
+    def __init__(self, target: Any, retries: int = 0, retry_backoff: float = 0.5) -> None:
+        self._target = target
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._client: Client | None = None
+        self._holder: asyncio.Task[None] | None = None
+        self._stop: asyncio.Event | None = None
+        self._connect_lock: asyncio.Lock | None = None
+
+    async def _hold(self, ready: asyncio.Future[None]) -> None:
+        from fastmcp import Client
+
+        try:
+            async with Client(self._target) as client:
+                self._client = client
+                self._stop = asyncio.Event()
+                ready.set_result(None)
+                await self._stop.wait()
+        except Exception as e:
+            # 연결 단계의 실패는 호출자에게 전달하고, 이후의 실패는 다음 호출 때 재연결합니다.
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            self._client = None
+
+    async def _ensure_client(self) -> Client:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._client is None or self._holder is None or self._holder.done():
+                ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+                self._holder = asyncio.create_task(self._hold(ready))
+                await ready
+            assert self._client is not None
+            return self._client
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        """도구를 호출합니다.
+
+        연결 단계에서 실패하면 모든 도구를 재시도하지만, 요청을 보낸 뒤의
+        전송 오류는 ``is_idempotent``인 호출만 재시도합니다.
+        """
+        import httpx
+
+        attempt = 0
+        while True:
+            try:
+                client = await self._ensure_client()
+            except Exception:
+                if attempt >= self._retries:
+                    raise
+            else:
+                try:
+                    return await client.call_tool(tool_name, arguments)
+                except (httpx.TransportError, ConnectionError):
+                    if attempt >= self._retries or not is_idempotent(tool_name, arguments):
+                        raise
+                    await self.aclose()
+            await asyncio.sleep(self._retry_backoff * (2 ** attempt))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """세션을 닫습니다. 열린 적이 없으면 아무 일도 하지 않습니다."""
+        holder, self._holder = self._holder, None
+        if self._stop is not None:
+            self._stop.set()
+        if holder is not None:
+            try:
+                await holder
+            except Exception:
+                pass
+
+
+class DirectDispatcher:
+    """같은 프로세스의 FastMCP 서버에 등록된 도구를 직접 호출합니다.
+
+    ``Tool.run``을 그대로 사용하므로 인자 검증과 결과 형태(content,
+    structured_content)는 MCP를 거칠 때와 같고, 프록시 직렬화와 메시지
+    프레이밍 비용만 빠집니다.
+
+    FastMCP는 동기 도구 함수를 이벤트 루프 안에서 그대로 실행하므로, 동기
+    도구(피드 수집, SMTP 발송 등)는 스레드에서 실행해 공유 루프를 막지 않습니다.
+    """
+
+    def __init__(self, server: FastMCP) -> None:
+        self._server = server
+        self._tools: dict[str, Any] = {}
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        from fastmcp.exceptions import ToolError
+
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            tool = await self._server.get_tool(tool_name)
+            self._tools[tool_name] = tool
+        try:
+            fn = getattr(tool, "fn", None)
+            if fn is None or inspect.iscoroutinefunction(fn):
+                return await tool.run(arguments)
+            return await asyncio.to_thread(asyncio.run, tool.run(arguments))
+        except ToolError:
+            raise
+        except Exception as e:
+            # MCP 클라이언트와 같은 예외 타입으로 맞춥니다.
+            raise ToolError(f"Error calling tool {tool_name!r}: {e}") from e
+
+    async def aclose(self) -> None:
+        self._tools.clear()
+
+
+def http_client_factory(
+    connect_timeout: float = 5.0,
+    read_timeout: float = 120.0,
+    retries: int = 2,
+    max_connections: int = 10,
+    keepalive_expiry: float = 60.0,
+) -> Any:
+    """keep-alive 연결을 재사용하는 httpx 클라이언트 팩토리를 만듭니다.
+
+    ``retries``는 TCP 연결 수립 실패에만 적용됩니다(httpx 전송 계층 재시도).
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+    def factory(
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+        **kwargs: Any,
+    ) -> httpx.AsyncClient:
+        # fastmcp 버전마다 넘기는 인자가 다르므로(예: follow_redirects) 나머지는 그대로 전달합니다.
+        kwargs.setdefault("follow_redirects", True)
+        return httpx.AsyncClient(
+            headers=headers,
+            auth=auth,
+            timeout=timeout or httpx.Timeout(read_timeout, connect=connect_timeout),
+            transport=httpx.AsyncHTTPTransport(retries=retries, limits=limits),
+            **kwargs,
+        )
+
+    return factory
+
+
+def _remote_session(url: str) -> MCPSession:
+    from fastmcp.client.transports import StreamableHttpTransport
+
+    retries = int(os.getenv("MCP_RETRIES", "2"))
+    read_timeout = float(os.getenv("MCP_READ_TIMEOUT", "120"))
+    # 읽기 제한 시간은 팩토리의 httpx 클라이언트에 설정합니다 (sse_read_timeout은 더 이상 쓰이지 않음).
+    transport = StreamableHttpTransport(
+        url,
+        httpx_client_factory=http_client_factory(
+            connect_timeout=float(os.getenv("MCP_CONNECT_TIMEOUT", "5")),
+            read_timeout=read_timeout,
+            retries=retries,
+            max_connections=int(os.getenv("MCP_MAX_CONNECTIONS", "10")),
+        ),
+    )
+    return MCPSession(transport, retries=retries)
+
+
+_LOOP = BackgroundLoop()
+_DISPATCHER: DirectDispatcher | MCPSession | None = None
+_DISPATCHER_LOCK = threading.Lock()
+_OVERRIDES: dict[str, str | None] = {"mode": None, "url": None}
+
+
+def configure(mode: str | None = None, server_url: str | None = None) -> None:
+    """환경 변수 대신 디스패치 모드와 서버 URL을 지정합니다.
+
+    이미 만들어진 공유 디스패처에는 적용되지 않으므로 첫 도구 호출 전에 부릅니다.
+    """
+    _OVERRIDES["mode"] = mode
+    _OVERRIDES["url"] = server_url
+
+
+def create_dispatcher(mode: str | None = None, server_url: str | None = None) -> DirectDispatcher | MCPSession:
+    """디스패치 모드에 맞는 새 디스패처를 만듭니다."""
+    url = server_url or _OVERRIDES["url"] or os.getenv("MCP_SERVER_URL")
+    mode = (mode or _OVERRIDES["mode"] or os.getenv("MCP_DISPATCH") or ("remote" if url else "direct")).lower()
+    if mode == "remote":
+        if not url:
+            raise ValueError("remote 모드에는 MCP_SERVER_URL(또는 --mcp-url)이 필요합니다.")
+        return _remote_session(url)
+    if mode in ("direct", "proxy"):
+        from fastmcp import FastMCP
+
+        from newsletter_server import app as mcp_app
+
+        if mode == "direct":
+            return DirectDispatcher(mcp_app)
+        return MCPSession(FastMCP.as_proxy(mcp_app))
+    raise ValueError(f"알 수 없는 MCP_DISPATCH 값입니다: {mode} (가능한 값: {', '.join(DISPATCH_MODES)})")
+
+
+def get_dispatcher() -> DirectDispatcher | MCPSession:
+    """프로세스 전체에서 공유하는 디스패처를 반환합니다."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        if _DISPATCHER is None:
+            _DISPATCHER = create_dispatcher()
+        return _DISPATCHER
+
+
+def shutdown() -> None:
+    """공유 디스패처와 백그라운드 루프를 정리합니다. 여러 번 호출해도 안전합니다."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        dispatcher, _DISPATCHER = _DISPATCHER, None
+    if dispatcher is not None:
+        try:
+            _LOOP.run(dispatcher.aclose(), timeout=10)
+        except Exception:
+            pass
+    _LOOP.stop()
+
+
+atexit.register(shutdown)
+
+
+@dataclass
+class PayloadRecord:
+    """도구 호출 1회가 LLM에 돌려준 결과의 크기."""
+
+    tool: str
+    encoding: str
+    bytes: int
+    tokens: int
+    truncated: bool
+
+
+class PayloadAccounting:
+    """도구별 결과 크기(바이트, 추정 토큰)를 누적합니다."""
+
+    def __init__(self, history: int = 256) -> None:
+        self._lock = threading.Lock()
+        self._records: deque[PayloadRecord] = deque(maxlen=history)
+        self._totals: dict[str, dict[str, int]] = {}
+
+    def record(self, record: PayloadRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            totals = self._totals.setdefault(
+                record.tool, {"calls": 0, "bytes": 0, "tokens": 0, "truncated": 0}
+            )
+            totals["calls"] += 1
+            totals["bytes"] += record.bytes
+            totals["tokens"] += record.tokens
+            totals["truncated"] += int(record.truncated)
+
+    def recent(self) -> list[PayloadRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {tool: dict(totals) for tool, totals in self._totals.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+
+
+PAYLOAD_STATS = PayloadAccounting()
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 토큰 수를 대략 추정합니다.
+
+    ASCII는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 약 1토큰으로 셉니다.
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+
+def _unwrap(structured: Any) -> Any:
+    # FastMCP는 원시 타입 반환값을 {"result": ...}로 감쌉니다.
+    if isinstance(structured, dict) and len(structured) == 1 and "result" in structured:
+        return structured["result"]
+    return structured
+
+
+def _text_blocks(result: Any) -> str | None:
+    texts = []
+    for block in result.content or []:
+        text = getattr(block, "text", None)
+        if text:
+            texts.append(text)
+    return "\n".join(texts) if texts else None
+
+
+def _truncate(text: str, max_chars: int) -> tuple[str, bool]:
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text, False
+    return text[:max_chars] + TRUNCATION_MARKER.format(omitted=len(text) - max_chars), True
+
+
+def _resolve_encoding(encoding: str | None) -> str:
+    encoding = (encoding or os.getenv("MCP_RESULT_ENCODING") or "compact").lower()
+    if encoding not in RESULT_ENCODINGS:
+        raise ValueError(
+            f"알 수 없는 결과 인코딩입니다: {encoding} (가능한 값: {', '.join(RESULT_ENCODINGS)})"
+        )
+    return encoding
+
+
+def _encode(result: Any, encoding: str, max_chars: int) -> tuple[Any, bool]:
+    structured = result.structured_content
+    if encoding == "structured":
+        return (_unwrap(structured) if structured else _text_blocks(result)), False
+
+    if encoding == "pretty" and structured:
+        text = json.dumps(structured, ensure_ascii=False, indent=2)
+    elif structured:
+        value = _unwrap(structured)
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = _text_blocks(result)
+    if text is None:
+        return "(no content returned)", False
+    return _truncate(text, max_chars)
+
+
+def encode_result(result: Any, encoding: str | None = None, max_chars: int | None = None) -> Any:
+    """도구 호출 결과를 지정한 인코딩으로 변환합니다.
+
+    ``structured``는 파이썬 객체를, 그 외 인코딩은 문자열을 반환합니다.
+    """
+    if max_chars is None:
+        max_chars = int(os.getenv("MCP_RESULT_MAX_CHARS") or 0)
+    return _encode(result, _resolve_encoding(encoding), max_chars)[0]
+
+
+def _record_payload(tool_name: str, encoding: str, text: str, truncated: bool) -> int:
+    size = len(text.encode("utf-8"))
+    PAYLOAD_STATS.record(
+        PayloadRecord(
+            tool=tool_name,
+            encoding=encoding,
+            bytes=size,
+            tokens=estimate_tokens(text),
+            truncated=truncated,
+        )
+    )
+    return size
+
+
+def _encode_and_account(tool_name: str, result: Any, encoding: str | None) -> tuple[Any, int]:
+    encoding = _resolve_encoding(encoding)
+    encoded, truncated = _encode(result, encoding, int(os.getenv("MCP_RESULT_MAX_CHARS") or 0))
+    if encoding == "structured":
+        # 코드가 소비하는 결과는 LLM에 그대로 가지 않으므로 PAYLOAD_STATS에 넣지 않습니다.
+        # LLM에 넘기는 부분은 호출한 쪽이 account_payload로 기록합니다.
+        if not isinstance(encoded, str):
+            encoded_text = json.dumps(encoded, ensure_ascii=False, separators=(",", ":"))
+        else:
+            encoded_text = encoded
+        return encoded, len(encoded_text.encode("utf-8"))
+    return encoded, _record_payload(tool_name, encoding, encoded, truncated)
+
+
+def account_payload(tool_name: str, text: str, truncate: bool = True) -> str:
+    """구조화된 결과로 만든 문자열을 LLM에 넘기기 전에 자르고(``MCP_RESULT_MAX_CHARS``) 기록합니다.
+
+    ``encoding="structured"``로 받은 결과를 가공해 도구 출력으로 돌려줄 때 씁니다.
+    """
+    text, truncated = _truncate(text, int(os.getenv("MCP_RESULT_MAX_CHARS") or 0) if truncate else 0)
+    _record_payload(tool_name, "rendered", text, truncated)
+    return text
+
+
+class ResultCache:
+    """도구 결과를 TTL과 LRU 크기 제한으로 보관합니다.
+
+    키는 (도구 이름, 키 순서를 정렬한 JSON 인자)이며, 인코딩 전의 원본 결과를
+    저장하므로 인코딩 설정이 바뀌어도 그대로 재사용됩니다.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float],
+        max_entries: int = 256,
+        clock: Any = time.monotonic,
+    ) -> None:
+        self._ttls = ttls
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "bypasses": 0, "evictions": 0, "expired": 0}
+
+    def cacheable(self, tool_name: str) -> bool:
+        return tool_name not in UNCACHEABLE_TOOLS and self._ttls.get(tool_name, 0) > 0
+
+    @staticmethod
+    def _key(tool_name: str, arguments: dict[str, Any]) -> tuple[str, str]:
+        return tool_name, json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+    def get(self, tool_name: str, arguments: dict[str, Any]) -> Any | None:
+        """캐시된 결과를 반환합니다. 없거나 만료됐으면 None입니다."""
+        key = self._key(tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self._counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def put(self, tool_name: str, arguments: dict[str, Any], result: Any) -> None:
+        key = self._key(tool_name, arguments)
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttls[tool_name], result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def note_bypass(self) -> None:
+        with self._lock:
+            self._counters["bypasses"] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+RESULT_CACHE = ResultCache(CACHE_TTLS, max_entries=int(os.getenv("MCP_CACHE_MAX_ENTRIES", "256")))
+
+
+def _cache_enabled(tool_name: str) -> bool:
+    return os.getenv("MCP_CACHE", "1") != "0" and RESULT_CACHE.cacheable(tool_name)
+
+
+_TAPE: Any = None
+
+
+def set_tape(tape: Any) -> None:
+    """도구 결과 기록기를 지정합니다. ``None``이면 기록하지 않습니다.
+
+    기록기는 ``replay(tool, arguments, encoding) -> (적중 여부, 값)``과
+    ``record(tool, arguments, encoding, value)``를 제공해야 합니다.
+    """
+    global _TAPE
+    _TAPE = tape
+
+
+def call_mcp(tool_name: str, *, encoding: str | None = None, cache: bool = True, **arguments: Any) -> Any:
+    """공유 디스패처로 MCP 도구를 호출합니다.
+
+    ``encoding``을 생략하면 ``MCP_RESULT_ENCODING`` 설정(compact/pretty)을 따르고,
+    ``encoding="structured"``를 넘기면 문자열 대신 구조화된 결과를 받습니다.
+    ``cache=False``면 캐시를 읽지 않고 새로 호출한 결과로 캐시를 갱신합니다.
+    """
+    start = time.perf_counter()
+    try:
+        tape = _TAPE
+        if tape is not None:
+            hit, encoded = tape.replay(tool_name, arguments, encoding)
+            if hit:
+                METRICS.observe("client", tool_name, time.perf_counter() - start)
+                return encoded
+        cached = _cache_enabled(tool_name)
+        result = RESULT_CACHE.get(tool_name, arguments) if cached and cache else None
+        if cached and not cache:
+            RESULT_CACHE.note_bypass()
+        if result is None:
+            result = _LOOP.run(get_dispatcher().call_tool(tool_name, arguments))
+            if cached:
+                RESULT_CACHE.put(tool_name, arguments, result)
+        encoded, size = _encode_and_account(tool_name, result, encoding)
+        if tape is not None:
+            tape.record(tool_name, arguments, encoding, encoded)
+    except Exception:
+        METRICS.observe("client", tool_name, time.perf_counter() - start, error=True)
+        raise
+    METRICS.observe("client", tool_name, time.perf_counter() - start, size)
+    return encoded
+
+
+async def acall_mcp(tool_name: str, *, encoding: str | None = None, cache: bool = True, **arguments: Any) -> Any:
+    """공유 디스패처로 MCP 도구를 비동기 호출합니다.
+
+    호출은 백그라운드 루프에서 실행되고 호출자의 루프는 그 결과를 await만
+    하므로, 여러 크루가 하나의 이벤트 루프를 공유해도 스레드를 붙잡지 않습니다.
+    """
+    start = time.perf_counter()
+    try:
+        tape = _TAPE
+        if tape is not None:
+            hit, encoded = tape.replay(tool_name, arguments, encoding)
+            if hit:
+                METRICS.observe("client", tool_name, time.perf_counter() - start)
+                return encoded
+        cached = _cache_enabled(tool_name)
+        result = RESULT_CACHE.get(tool_name, arguments) if cached and cache else None
+        if cached and not cache:
+            RESULT_CACHE.note_bypass()
+        if result is None:
+            coro = get_dispatcher().call_tool(tool_name, arguments)
+            if _LOOP.in_loop_thread():
+                result = await coro
+            else:
+                result = await asyncio.wrap_future(_LOOP.submit(coro))
+            if cached:
+                RESULT_CACHE.put(tool_name, arguments, result)
+        encoded, size = _encode_and_account(tool_name, result, encoding)
+        if tape is not None:
+            tape.record(tool_name, arguments, encoding, encoded)
+    except Exception:
+        METRICS.observe("client", tool_name, time.perf_counter() - start, error=True)
+        raise
+    METRICS.observe("client", tool_name, time.perf_counter() - start, size)
+    return encoded
+
+
+def _batch_payload(calls: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+    return [{"tool": tool_name, "arguments": arguments} for tool_name, arguments in calls]
+
+
+def call_mcp_batch(calls: list[tuple[str, dict[str, Any]]], max_concurrency: int = 4) -> list[dict[str, Any]]:
+    """여러 도구 호출을 ``batch_call`` 한 번의 왕복으로 실행합니다.
+
+    반환값은 요청 순서대로 ``{"index", "tool", "ok", "result", "error"}`` 항목입니다.
+    """
+    return call_mcp(
+        "batch_call", encoding="structured", calls=_batch_payload(calls), max_concurrency=max_concurrency
+    )
+
+
+async def acall_mcp_batch(calls: list[tuple[str, dict[str, Any]]], max_concurrency: int = 4) -> list[dict[str, Any]]:
+    """``call_mcp_batch``의 비동기 버전입니다."""
+    return await acall_mcp(
+        "batch_call", encoding="structured", calls=_batch_payload(calls), max_concurrency=max_concurrency
+    )
@@ -4,93 +4,104 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import importlib
 import json
 import os
+import sys
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from crewai import Agent, Crew, Process, Task
-from crewai.tools import BaseTool
 from dotenv import load_dotenv
-from fastmcp import Client, FastMCP
-from pydantic import BaseModel, Field
-
-from newsletter_server import app as mcp_app
-
-load_dotenv()
-
-PROXY_SERVER = FastMCP.as_proxy(mcp_app)
-
-
-def _call_mcp(tool_name: str, **arguments: Any) -> str:
-    """MCP 도구를 비동기적으로 호출합니다."""
-    async def _invoke() -> str:
-        async with Client(PROXY_SERVER) as client:
-            result = await client.call_tool(tool_name, arguments)
-            if result.structured_content:
-                return json.dumps(result.structured_content, ensure_ascii=False, indent=2)
-            if result.content:
-                texts = []
-                for block in result.content:
-                    text = getattr(block, "text", None)
-                    if text:
-                        texts.append(text)
-                if texts:
-                    return "\n".join(texts)
-            return "(no content returned)"
-
-    return asyncio.run(_invoke())
-
-
-class FetchNewsInput(BaseModel):
-    count: str = Field(default="5", description="수집할 뉴스 개수")
-
-class FetchNewsTool(BaseTool):
-    name: str = "fetch_news_tool"
-    description: str = "AI/Tech 뉴스를 수집합니다"
-    args_schema: type[BaseModel] = FetchNewsInput
-
-    def _run(self, count: str = "5") -> str:
-        try:
-            return _call_mcp("fetch_tech_news", count=int(count))
-        except Exception as e:
-            return f"뉴스 수집 중 오류: {str(e)}"
-
-
-class CreateNewsletterInput(BaseModel):
-    title: str = Field(description="뉴스레터 제목")
-    content: str = Field(description="뉴스 내용")
-    intro: str = Field(default="", description="서론 텍스트")
-
-class CreateNewsletterTool(BaseTool):
-    name: str = "create_newsletter_tool"
-    description: str = "HTML 뉴스레터를 생성합니다"
-    args_schema: type[BaseModel] = CreateNewsletterInput
-
-    def _run(self, title: str, content: str, intro: str = "") -> str:
-        return _call_mcp("create_newsletter_html", title=title, news_content=content, intro_text=intro)
-
-
-
-
-class SendEmailInput(BaseModel):
-    recipient: str = Field(description="받는 사람 이메일")
-    subject: str = Field(description="이메일 제목")
-    body: str = Field(description="이메일 본문")
-
-class SendEmailTool(BaseTool):
-    name: str = "send_email_tool"
-    description: str = "이메일을 발송합니다"
-    args_schema: type[BaseModel] = SendEmailInput
-
-    def _run(self, recipient: str, subject: str, body: str) -> str:
-        return _call_mcp("send_email", to=recipient, subject=subject, body=body)
 
+import newsletter_client
+from newsletter_metrics import LLM_USAGE, METRICS
 
+if TYPE_CHECKING:
+    from crewai import Agent, Crew, Task
 
+load_dotenv()
 
-def build_agents(model_name: str) -> tuple[Agent, Agent, Agent]:
-    """뉴스레터 제작을 위한 3개의 에이전트를 생성합니다."""
+# 편집 단계 방식: agent(편집 에이전트 한 턴) 또는 fanout(기사별 병렬 요약 후 서론 조립)
+EDIT_MODES = ("agent", "fanout")
+EDIT_MODE = os.getenv("EDIT_MODE", "agent")
+# 발송 단계 방식: agent(발송 에이전트), suggest(LLM은 제목만 제안), direct(LLM 없이 뉴스레터 제목으로 발송)
+SEND_MODES = ("agent", "suggest", "direct")
+SEND_MODE = os.getenv("SEND_MODE", "agent")
+# 역할별 모델. 지정하지 않은 역할은 --model(OPENAI_MODEL)을 씁니다. fanout 편집은 editor,
+# 제목 제안은 sender 모델을 씁니다.
+AGENT_ROLES = ("researcher", "editor", "sender")
+AGENT_MODELS = os.getenv("AGENT_MODELS", "")
+SUBJECT_PROMPT = (
+    "당신은 이메일 캠페인 매니저입니다. 아래 뉴스레터의 이메일 제목을 한국어로 40자 이내 한 줄로 "
+    "제안하세요. 따옴표 없이 제목만 출력하세요."
+)
+KST = timezone(timedelta(hours=9))
+
+# --import-report가 측정하는 무거운 의존성 (단계별로 처음 필요할 때 불러옵니다)
+STAGE_MODULES = (
+    "pydantic",
+    "httpx",
+    "fastmcp",
+    "crewai",
+    "newsletter_server",
+    "newsletter_tools",
+)
+
+
+def import_report(modules: tuple[str, ...] = STAGE_MODULES) -> list[tuple[str, float]]:
+    """모듈을 순서대로 import하며 각각 걸린 시간(ms)을 잽니다.
+
+    앞선 모듈과 공유하는 의존성은 먼저 불러온 모듈의 시간에 포함됩니다.
+    이미 불러온 모듈은 0에 가깝게 나옵니다.
+    """
+    report = []
+    for name in modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        report.append((name, (time.perf_counter() - start) * 1000))
+    return report
+
+
+def parse_agent_models(spec: str | None) -> dict[str, str]:
+    """``"researcher=gpt-4o-mini,editor=gpt-4o"`` 형식을 역할별 모델로 바꿉니다."""
+    models = {}
+    for part in (spec or "").split(","):
+        role, sep, model = part.partition("=")
+        role, model = role.strip(), model.strip()
+        if not sep or not role:
+            continue
+        if role not in AGENT_ROLES:
+            raise ValueError(f"알 수 없는 에이전트 역할입니다: {role} (가능한 값: {', '.join(AGENT_ROLES)})")
+        if model:
+            models[role] = model
+    return models
+
+
+def resolve_models(model_name: str, agent_models: dict[str, str] | None = None) -> dict[str, str]:
+    """모든 역할의 모델을 채웁니다. ``agent_models``에 없는 역할은 ``model_name``입니다."""
+    return {role: (agent_models or {}).get(role) or model_name for role in AGENT_ROLES}
+
+
+def newsletter_title(today: datetime) -> str:
+    return f"AI 뉴스레터 - {today.strftime('%Y년 %m월 %d일')}"
+
+
+def build_agents(model_name: str, agent_models: dict[str, str] | None = None) -> tuple[Agent, Agent, Agent]:
+    """뉴스레터 제작을 위한 3개의 에이전트를 생성합니다.
+
+    에이전트마다 역할별 모델(``agent_models``, 없으면 ``model_name``)의 LLM을 따로 두고,
+    호출은 ``LLM_CACHE``(``LLM_CACHE_MODE``)를 거쳐 역할 이름으로 ``LLM_USAGE``에 기록됩니다.
+    캐시가 켜져 있으면 MCP 도구 결과도 같은 캐시에 기록합니다.
+    """
+    from crewai import Agent
+
+    from newsletter_llm import make_llm
+    from newsletter_llm_cache import LLM_CACHE
+
+    newsletter_client.set_tape(LLM_CACHE if LLM_CACHE.enabled else None)
+    models = resolve_models(model_name, agent_models)
 
     news_researcher = Agent(
         role="News Researcher",
@@ -99,7 +110,7 @@ def build_agents(model_name: str) -> tuple[Agent, Agent, Agent]:
             "5년 차 테크 저널리스트로, AI와 스타트업 생태계 동향을 추적하는 전문가. "
             "독자들이 정말 알아야 할 뉴스와 트렌드를 선별하는 눈이 뛰어나다."
         ),
-        llm=model_name,
+        llm=make_llm(models["researcher"], "researcher"),
         verbose=True,
     )
 
@@ -110,7 +121,7 @@ def build_agents(model_name: str) -> tuple[Agent, Agent, Agent]:
             "B2B 테크 미디어에서 7년간 콘텐츠를 편집한 베테랑. "
             "복잡한 기술 내용을 일반인도 이해할 수 있게 한국어로 정리하고 뉴스레터로 디자인하는 능력이 탁월하다."
         ),
-        llm=model_name,
+        llm=make_llm(models["editor"], "editor"),
         verbose=True,
     )
 
@@ -121,7 +132,7 @@ def build_agents(model_name: str) -> tuple[Agent, Agent, Agent]:
             "이메일 마케팅 플랫폼에서 4년간 캠페인을 관리한 전문가. "
             "발송 타이밍, 제목 최적화를 통해 성과를 극대화한다."
         ),
-        llm=model_name,
+        llm=make_llm(models["sender"], "sender"),
         verbose=True,
     )
 
@@ -132,48 +143,70 @@ def build_tasks(
     news_researcher: Agent,
     content_editor: Agent,
     email_sender: Agent,
-    recipient_email: str
+    recipient_email: str,
+    today: datetime | None = None,
+    structured: bool = False,
+    html_as_answer: bool = False,
 ) -> tuple[Task, Task, Task]:
-    """뉴스레터 제작 워크플로우의 3개 태스크를 생성합니다."""
+    """뉴스레터 제작 워크플로우의 3개 태스크를 생성합니다.
+
+    ``today``를 지정하면 제목 날짜를 고정합니다 (지난 실행을 재현할 때).
+    ``structured``면 뉴스 수집 결과를 ``SelectedNews``로 받습니다 (fanout 편집용).
+    ``html_as_answer``면 뉴스레터 제작 태스크의 출력이 에이전트의 답 대신
+    ``create_newsletter_tool``이 돌려준 HTML artifact 핸들 그대로가 됩니다 (발송 단계에 직접 넘길 때).
+    """
+    from crewai import Task
+
+    from newsletter_tools import CreateNewsletterTool, FetchNewsTool, SendEmailTool
+
+    selection: dict[str, Any] = {"expected_output": "선별된 3개 뉴스의 제목, 링크, 요약 정보"}
+    if structured:
+        from newsletter_summarize import SelectedNews
+
+        selection = {
+            "expected_output": "선별된 3개 뉴스의 title, link, summary, text, source (도구 결과의 값을 그대로)",
+            "output_pydantic": SelectedNews,
+        }
 
     fetch_news = Task(
         name="뉴스 수집",
         description=(
             "최신 AI와 기술 뉴스를 수집하세요. "
-            "fetch_news_tool을 사용하여 5개의 최신 뉴스를 가져오고, "
-            "각 뉴스의 중요도와 관련성을 평가하여 상위 3개를 선별하세요."
+            "fetch_news_tool을 사용하여 5개의 뉴스를 가져오고, "
+            "각 뉴스의 중요도와 관련성을 평가하여 상위 3개를 선별하세요. "
+            "도구는 최신성과 주제 관련도로 미리 점수를 매겨 점수(score) 순으로 정렬한 후보를 반환합니다. "
+            "도구가 ❌로 시작하는 오류를 반환하면 뉴스를 지어내지 말고 오류 내용을 그대로 보고하세요."
         ),
-        expected_output="선별된 3개 뉴스의 제목, 링크, 요약 정보",
         agent=news_researcher,
         tools=[FetchNewsTool()],
+        **selection,
     )
 
-    # 한국 시간대(KST) 기준 오늘 날짜 계산
-    kst = timezone(timedelta(hours=9))
-    today = datetime.now(kst)
-    today_str = today.strftime("%Y년 %m월 %d일")
-    
+    # 한국 시간대(KST) 기준 오늘 날짜
+    title = newsletter_title(today or datetime.now(KST))
+
     create_newsletter = Task(
         name="뉴스레터 제작",
         description=(
             f"수집된 뉴스를 분석하고 독자 친화적으로 큐레이션한 후, "
             f"create_newsletter_tool을 사용하여 HTML 뉴스레터를 완성하세요. "
-            f"제목은 반드시 'AI 뉴스레터 - {today_str}' 형식으로 사용하고, "
+            f"제목은 반드시 '{title}' 형식으로 사용하고, "
             f"서론(intro_text)과 뉴스 내용은 모두 한국어로 작성하세요. "
-            f"각 뉴스에 대한 인사이트와 매력적인 서론을 한국어로 포함하세요."
+            f"각 뉴스에 대한 인사이트와 매력적인 서론을 한국어로 포함하세요. "
+            f"도구는 HTML 대신 저장된 뉴스레터의 핸들을 반환하므로 HTML을 옮겨 적지 말고 핸들을 그대로 답하세요."
         ),
-        expected_output="완성된 HTML 뉴스레터 (한국어로 작성됨)",
+        expected_output="create_newsletter_tool이 반환한 뉴스레터 핸들 (artifact:... 포함, 한국어로 작성된 뉴스레터)",
         agent=content_editor,
         context=[fetch_news],
-        tools=[CreateNewsletterTool()],
+        tools=[CreateNewsletterTool(result_as_answer=html_as_answer)],
     )
 
     send_newsletter = Task(
         name="뉴스레터 발송",
         description=(
             f"완성된 HTML 뉴스레터를 {recipient_email}에게 발송하세요. "
-            "HTML 뉴스레터를 이메일 본문으로 사용하고, "
-            "적절한 제목을 만들어서 send_email_tool을 사용하여 실제 발송하세요."
+            "이전 단계가 넘긴 뉴스레터 핸들의 artifact 값(artifact:...)을 send_email_tool의 body에 그대로 넣고, "
+            "적절한 제목을 만들어서 send_email_tool을 사용하여 실제 발송하세요. HTML을 직접 옮겨 적지 마세요."
         ),
         expected_output="이메일 발송 완료 확인 메시지",
         agent=email_sender,
@@ -184,22 +217,247 @@ def build_tasks(
     return fetch_news, create_newsletter, send_newsletter
 
 
-def run_newsletter_crew(recipient_email: str, model_name: str) -> str:
-    """뉴스레터 제작 및 발송을 실행합니다."""
-    news_researcher, content_editor, email_sender = build_agents(model_name)
+def build_send_html_task(email_sender: Agent, recipient_email: str, html: str) -> Task:
+    """이미 만들어진 HTML 뉴스레터를 발송하는 태스크 (fanout 편집 뒤).
+
+    HTML은 artifact 저장소에 넣고 에이전트에는 핸들만 보여 줍니다.
+    """
+    from crewai import Task
+
+    from newsletter_artifacts import ARTIFACTS
+    from newsletter_tools import SendEmailTool
+
+    artifact = ARTIFACTS.put(html, "text/html")
+    return Task(
+        name="뉴스레터 발송",
+        description=(
+            f"완성된 HTML 뉴스레터를 {recipient_email}에게 발송하세요. "
+            f"뉴스레터 핸들은 {artifact.handle()} 입니다. "
+            f"send_email_tool의 body에 {artifact.ref}를 그대로 넣고, "
+            "적절한 제목을 만들어서 send_email_tool을 사용하여 실제 발송하세요. HTML을 직접 옮겨 적지 마세요."
+        ),
+        expected_output="이메일 발송 완료 확인 메시지",
+        agent=email_sender,
+        tools=[SendEmailTool()],
+    )
+
+
+def edit_fanout(selected: Any, model_name: str, title: str) -> str:
+    """선별된 기사를 기사별 병렬 요약(map)과 서론 작성(reduce)으로 HTML 뉴스레터로 만듭니다."""
+    from newsletter_llm import make_llm
+    from newsletter_summarize import SUMMARY_TIMEOUT, compose_intro, render_stories, summarize_articles
+
+    llm = make_llm(model_name, "editor", timeout=SUMMARY_TIMEOUT)
+    start = time.perf_counter()
+    stories = summarize_articles(llm, selected.articles)
+    intro = compose_intro(llm, stories)
+    slowest = max((story.seconds for story in stories), default=0.0)
+    print(
+        f"🧩 기사 {len(stories)}개 병렬 요약: {time.perf_counter() - start:.1f}s "
+        f"(가장 느린 기사 {slowest:.1f}s, 합계 {sum(story.seconds for story in stories):.1f}s)"
+    )
+    for story in stories:
+        if story.error:
+            print(f"⚠️  요약 실패로 원문 요약 사용: {story.title} ({story.error})")
+    # 발송 단계에 그대로 넘기므로 MCP_RESULT_MAX_CHARS로 잘리지 않게 원본을 받습니다.
+    return newsletter_client.call_mcp(
+        "create_newsletter_html",
+        encoding="structured",
+        title=title,
+        news_content=render_stories(stories),
+        intro_text=intro,
+    )
+
+
+def build_crew(
+    recipient_email: str,
+    model_name: str,
+    today: datetime | None = None,
+    agent_models: dict[str, str] | None = None,
+) -> Crew:
+    """에이전트와 태스크를 묶어 뉴스레터 크루를 생성합니다."""
+    from crewai import Crew, Process
+
+    news_researcher, content_editor, email_sender = build_agents(model_name, agent_models)
     fetch_news, create_newsletter, send_newsletter = build_tasks(
-        news_researcher, content_editor, email_sender, recipient_email
+        news_researcher, content_editor, email_sender, recipient_email, today
     )
 
-    crew = Crew(
+    return Crew(
         agents=[news_researcher, content_editor, email_sender],
         tasks=[fetch_news, create_newsletter, send_newsletter],
         process=Process.sequential,
         verbose=True,
     )
 
-    result = crew.kickoff()
-    return result
+
+def export_metrics(models: dict[str, str] | None = None) -> None:
+    """도구 지표와 에이전트별 LLM 사용량 JSON 요약을 출력하고 저장합니다.
+
+    ``METRICS_PROM_FILE``은 node_exporter textfile collector 등이 읽을 경로입니다.
+    LLM 사용량은 실행마다 한 줄씩 ``LLM_USAGE_LOG``(기본 ``NEWSLETTER_CACHE_DIR/llm_usage.jsonl``,
+    ``0``이면 저장하지 않음)에 덧붙여 단계별 모델 선택을 실행 기록으로 비교할 수 있게 합니다.
+    """
+    print("📈 도구 지표:", METRICS.to_json())
+    usage = LLM_USAGE.summary()
+    if usage:
+        print("🤖 에이전트별 LLM 사용량:", LLM_USAGE.to_json())
+    prom_file = os.getenv("METRICS_PROM_FILE")
+    if prom_file:
+        with open(prom_file, "w", encoding="utf-8") as f:
+            f.write(METRICS.to_prometheus() + LLM_USAGE.to_prometheus())
+    usage_log = os.getenv("LLM_USAGE_LOG")
+    if usage and usage_log != "0":
+        from newsletter_feeds import CACHE_DIR
+
+        path = Path(usage_log) if usage_log else CACHE_DIR / "llm_usage.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"finished_at": datetime.now(KST).isoformat(timespec="seconds"), "models": models, "agents": usage}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _editing_crew(
+    recipient_email: str, models: dict[str, str], today: datetime, edit_mode: str
+) -> tuple[Crew, Agent]:
+    """HTML을 만드는 데 필요한 태스크까지만 담은 크루와 발송 에이전트를 만듭니다.
+
+    agent 편집이면 뉴스레터 제작 태스크의 출력이 도구가 만든 HTML 그대로가 되고,
+    fanout 편집이면 뉴스 수집 태스크만 실행해 ``SelectedNews``를 받습니다.
+    """
+    from crewai import Crew, Process
+
+    news_researcher, content_editor, email_sender = build_agents(models["researcher"], models)
+    fetch_news, create_newsletter, _ = build_tasks(
+        news_researcher,
+        content_editor,
+        email_sender,
+        recipient_email,
+        today,
+        structured=edit_mode == "fanout",
+        html_as_answer=True,
+    )
+    if edit_mode == "fanout":
+        agents, tasks = [news_researcher], [fetch_news]
+    else:
+        agents, tasks = [news_researcher, content_editor], [fetch_news, create_newsletter]
+    return Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True), email_sender
+
+
+def _rendered_html(output: Any, model_name: str, today: datetime, edit_mode: str) -> str | None:
+    """편집 크루의 출력에서 발송할 HTML을 얻습니다. 발송할 것이 없으면 None입니다."""
+    if edit_mode == "fanout":
+        selected = output.pydantic
+        if selected is None or not selected.articles:
+            return None
+        return edit_fanout(selected, model_name, newsletter_title(today))
+    from newsletter_artifacts import ARTIFACTS, find_ref
+
+    # 도구를 부르지 못하고 에이전트가 직접 답한 경우(예: 뉴스 수집 오류 보고)에는 핸들이 없습니다.
+    artifact_id = find_ref(str(output.raw))
+    return ARTIFACTS.get(artifact_id) if artifact_id else None
+
+
+def propose_subject(model_name: str, title: str, html: str) -> str:
+    """뉴스레터 내용을 보고 LLM이 이메일 제목 한 줄을 제안합니다. 실패하면 ``title``입니다."""
+    from newsletter_llm import make_llm
+    from newsletter_summarize import SUMMARY_TIMEOUT
+    from newsletter_text import html_to_text, truncate_words
+
+    messages = [
+        {"role": "system", "content": SUBJECT_PROMPT},
+        {"role": "user", "content": f"기본 제목: {title}\n\n{truncate_words(html_to_text(html), 1500)}"},
+    ]
+    try:
+        lines = str(make_llm(model_name, "sender", timeout=SUMMARY_TIMEOUT).call(messages)).strip().splitlines()
+    except Exception as e:
+        print(f"⚠️  제목 제안 실패로 기본 제목 사용: {e}")
+        return title
+    subject = lines[0].strip().strip("\"'") if lines else ""
+    return subject or title
+
+
+def send_direct(recipient_email: str, html: str, model_name: str, today: datetime, send_mode: str) -> str:
+    """LLM을 거치지 않고 HTML을 그대로 본문으로 발송합니다.
+
+    ``send_mode="suggest"``면 제목만 LLM에게 제안받고, ``direct``면 뉴스레터 제목을 씁니다.
+    """
+    from newsletter_tools import send_newsletter_email
+
+    title = newsletter_title(today)
+    subject = propose_subject(model_name, title, html) if send_mode == "suggest" else title
+    return send_newsletter_email(recipient_email, subject, html)
+
+
+def _send_crew(email_sender: Agent, recipient_email: str, html: str) -> Crew:
+    from crewai import Crew, Process
+
+    return Crew(
+        agents=[email_sender],
+        tasks=[build_send_html_task(email_sender, recipient_email, html)],
+        process=Process.sequential,
+        verbose=True,
+    )
+
+
+def run_newsletter_crew(
+    recipient_email: str,
+    model_name: str,
+    today: datetime | None = None,
+    edit_mode: str = EDIT_MODE,
+    send_mode: str = SEND_MODE,
+    agent_models: dict[str, str] | None = None,
+) -> Any:
+    """뉴스레터 제작 및 발송을 실행합니다.
+
+    편집과 발송이 모두 agent면 세 태스크를 한 크루로 실행합니다. 그 외에는 HTML까지
+    만드는 크루(또는 뉴스 수집 크루 + fanout 편집)를 실행한 뒤, 그 HTML을 발송 단계에
+    그대로 넘깁니다. 발송할 HTML이 없으면 발송하지 않고 크루 출력(오류 보고)을 반환합니다.
+    ``agent_models``로 역할(researcher/editor/sender)별 모델을 바꿀 수 있습니다.
+    """
+    models = resolve_models(model_name, agent_models)
+    try:
+        if edit_mode == "agent" and send_mode == "agent":
+            return build_crew(recipient_email, model_name, today, models).kickoff()
+        today = today or datetime.now(KST)
+        crew, email_sender = _editing_crew(recipient_email, models, today, edit_mode)
+        output = crew.kickoff()
+        html = _rendered_html(output, models["editor"], today, edit_mode)
+        if html is None:
+            return output
+        if send_mode == "agent":
+            return _send_crew(email_sender, recipient_email, html).kickoff()
+        return send_direct(recipient_email, html, models["sender"], today, send_mode)
+    finally:
+        export_metrics(models)
+
+
+async def arun_newsletter_crew(
+    recipient_email: str,
+    model_name: str,
+    today: datetime | None = None,
+    edit_mode: str = EDIT_MODE,
+    send_mode: str = SEND_MODE,
+    agent_models: dict[str, str] | None = None,
+) -> Any:
+    """``run_newsletter_crew``를 워커 스레드에서 실행해 이벤트 루프를 막지 않고 기다립니다.
+
+    crewai는 도구를 동기(``_run``)로만 호출하고 ``kickoff_async``도 스레드에서
+    ``kickoff``를 돌리므로, 여러 호수(edition)를 ``asyncio.gather``로 함께 실행하면
+    호수마다 스레드 하나를 씁니다. 도구 호출은 그 스레드들이 공유하는 MCP 디스패처로 갑니다.
+    """
+    return await asyncio.to_thread(
+        run_newsletter_crew, recipient_email, model_name, today, edit_mode, send_mode, agent_models
+    )
+
+
+def _resumable(last_run: dict[str, Any] | None, run: dict[str, Any]) -> bool:
+    """지난 실행이 오늘 같은 인자로 시작했지만 발송하지 못했는지 확인합니다."""
+    if not last_run or last_run.get("completed") or not last_run.get("run_id"):
+        return False
+    if any(last_run.get(name) != value for name, value in run.items()):
+        return False
+    return datetime.fromisoformat(last_run["today"]).astimezone(KST).date() == datetime.now(KST).date()
 
 
 def main() -> None:
@@ -214,22 +472,123 @@ def main() -> None:
         default=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
         help="사용할 LLM 이름(OpenAI 호환)",
     )
+    parser.add_argument(
+        "--agent-models",
+        default=AGENT_MODELS,
+        help="역할별 모델 (예: researcher=gpt-4o-mini,editor=gpt-4o,sender=gpt-4o-mini). 없는 역할은 --model",
+    )
+    parser.add_argument(
+        "--mcp-url",
+        default=os.getenv("MCP_SERVER_URL"),
+        help="실행 중인 HTTP MCP 서버 주소 (예: http://127.0.0.1:8000/mcp/). 지정하지 않으면 서버를 프로세스 안에서 실행",
+    )
+    parser.add_argument(
+        "--edit-mode",
+        choices=EDIT_MODES,
+        default=EDIT_MODE,
+        help="편집 단계 방식: agent(편집 에이전트) 또는 fanout(기사별 병렬 요약, SUMMARY_MAX_CONCURRENCY/SUMMARY_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--send-mode",
+        choices=SEND_MODES,
+        default=SEND_MODE,
+        help="발송 단계 방식: agent(발송 에이전트), suggest(제목만 LLM 제안), direct(LLM 없이 발송)",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=("rw", "record", "replay", "off"),
+        default=os.getenv("LLM_CACHE_MODE", "rw"),
+        help="LLM 완성 캐시 모드. replay는 마지막 기록 실행을 캐시만으로 재현 (네트워크/API 키 불필요)",
+    )
+    parser.add_argument(
+        "--import-report",
+        action="store_true",
+        help="단계별 무거운 모듈의 import 시간을 출력하고 종료 (예산: IMPORT_BUDGET_MS)",
+    )
     args = parser.parse_args()
 
-    if not os.getenv("OPENAI_API_KEY"):
+    if args.import_report:
+        report = import_report()
+        for name, elapsed in report:
+            print(f"{name:<20} {elapsed:8.1f} ms")
+        total = sum(elapsed for _, elapsed in report)
+        budget = float(os.getenv("IMPORT_BUDGET_MS") or 0)
+        print(f"{'합계':<18} {total:8.1f} ms" + (f" (예산 {budget:.0f} ms)" if budget else ""))
+        if budget and total > budget:
+            sys.exit(1)
+        return
+
+    from newsletter_llm_cache import LLM_CACHE
+
+    LLM_CACHE.mode = args.llm_cache
+    today = None
+    last_run = LLM_CACHE.last_run()
+    if LLM_CACHE.replaying:
+        # 프롬프트가 같아야 캐시 키가 같으므로 기록된 실행의 인자를 그대로 씁니다.
+        if last_run is None:
+            raise RuntimeError(f"재현할 실행 기록이 없습니다: {LLM_CACHE.directory}")
+        args.email, args.model = last_run["email"], last_run["model"]
+        args.agent_models = last_run.get("agent_models") or ""
+        args.edit_mode = last_run.get("edit_mode", "agent")
+        args.send_mode = last_run.get("send_mode", "agent")
+        today = datetime.fromisoformat(last_run["today"])
+        LLM_CACHE.resume_run(last_run)
+    elif not os.getenv("OPENAI_API_KEY"):
         raise RuntimeError("OPENAI_API_KEY 환경 변수를 설정해 주세요.")
     
     if not args.email:
         raise RuntimeError("이메일 주소를 --email 인자로 제공하거나 RECIPIENT_EMAIL 또는 EMAIL 환경 변수로 설정해 주세요.")
 
+    run = {
+        "email": args.email,
+        "model": args.model,
+        "agent_models": args.agent_models,
+        "edit_mode": args.edit_mode,
+        "send_mode": args.send_mode,
+    }
+    if today is None and LLM_CACHE.mode == "rw" and _resumable(last_run, run):
+        # 오늘 발송하지 못한 같은 실행은 같은 뉴스와 날짜로 이어서 해 LLM 캐시를 그대로 씁니다.
+        today = datetime.fromisoformat(last_run["today"])
+        LLM_CACHE.resume_run(last_run)
+        print(f"♻️  발송하지 못한 지난 실행({last_run['run_id']})을 이어서 진행합니다")
+    if today is None:
+        today = datetime.now(KST)
+        LLM_CACHE.begin_run({**run, "today": today.isoformat()})
+
+    newsletter_client.configure(server_url=args.mcp_url)
+
     print(f"🗞️  AI 뉴스레터 제작을 시작합니다 (수신자: {args.email})")
     print("=" * 60)
 
-    result = run_newsletter_crew(args.email, args.model)
+    try:
+        result = run_newsletter_crew(
+            args.email, args.model, today, args.edit_mode, args.send_mode, parse_agent_models(args.agent_models)
+        )
+    finally:
+        newsletter_client.shutdown()
 
     print("\n" + "=" * 60)
     print("✅ 뉴스레터 제작 및 발송 완료!")
     print("📧 결과:", result)
+    for tool, totals in newsletter_client.PAYLOAD_STATS.summary().items():
+        print(
+            f"📦 {tool}: {totals['calls']}회 호출, {totals['bytes']:,} bytes, "
+            f"약 {totals['tokens']:,} 토큰 (잘림 {totals['truncated']}회)"
+        )
+    cache_stats = newsletter_client.RESULT_CACHE.stats()
+    print(f"🗄️  도구 결과 캐시: 적중 {cache_stats['hits']}회, 미스 {cache_stats['misses']}회")
+    for agent, usage in LLM_USAGE.summary().items():
+        cost = f"${usage['cost_usd']:.4f}" + (" 이상 (가격 모름 포함)" if usage["unpriced_calls"] else "")
+        print(
+            f"🤖 {agent} ({', '.join(usage['models'])}): {usage['calls']}회 호출 (캐시 {usage['cache_hits']}회), "
+            f"{usage['latency_ms']['total'] / 1000:.1f}s, 토큰 {usage['prompt_tokens']:,}+{usage['completion_tokens']:,}, "
+            f"추정 비용 {cost}"
+        )
+    llm_stats = LLM_CACHE.stats()
+    print(
+        f"🧠 LLM 캐시({LLM_CACHE.mode}): 적중 {llm_stats['hits']}회, 미스 {llm_stats['misses']}회, "
+        f"저장 {llm_stats['writes']}회"
+    )
 
 
 if __name__ == "__main__":
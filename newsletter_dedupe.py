@@ -0,0 +1,142 @@
+"""Near-duplicate story detection with MinHash signatures and an LSH index.
+
+제목+요약을 단어 3-gram(shingle) 집합으로 만들고 MinHash 서명을 계산한 뒤,
+서명을 ``BANDS``개의 밴드로 나눠 해시한 키로 후보를 찾습니다(LSH). 후보만
+서명으로 유사도를 확인하므로 새 기사 하나를 비교하는 비용은 누적된 기사
+수에 비례하지 않습니다. 같은 밴드 키는 ``ArticleStore``에도 저장되어 이전
+실행에서 다룬 기사와의 비교에도 쓰입니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import re
+import struct
+from typing import Iterable
+
+from newsletter_article import Article
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# 추정 Jaccard 유사도가 이 값 이상이면 같은 이야기로 봅니다.
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.5"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 61) - 1
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+
+Signature = tuple[int, ...]
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """태그를 지우고 소문자로 바꾼 텍스트의 단어 k-gram 집합."""
+    words = _WORD_RE.findall(_TAG_RE.sub(" ", text).lower())
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def _base_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """``h(x) = (a*x + b) mod p`` 형태의 해시 ``num_perm``개로 MinHash를 계산합니다."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Iterable[str]) -> Signature:
+        hashes = [_base_hash(feature) for feature in features]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._params
+        )
+
+
+MINHASHER = MinHasher()
+
+
+def item_signature(item: Article) -> Signature:
+    return MINHASHER.signature(shingles(f"{item.title} {item.summary}"))
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """두 서명으로 추정한 Jaccard 유사도."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def band_keys(signature: Signature, bands: int = BANDS) -> list[str]:
+    """서명을 밴드별로 해시한 LSH 키 목록."""
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = struct.pack(f"<{rows}Q", *signature[band * rows:(band + 1) * rows])
+        keys.append(f"{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+    return keys
+
+
+def pack_signature(signature: Signature) -> bytes:
+    return struct.pack(f"<{len(signature)}Q", *signature)
+
+
+def unpack_signature(data: bytes) -> Signature:
+    return struct.unpack(f"<{len(data) // 8}Q", data)
+
+
+class LSHIndex:
+    """메모리 안의 LSH 인덱스. 밴드 키가 하나라도 겹치는 항목이 후보입니다."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, list[int]] = {}
+        self._signatures: list[Signature] = []
+
+    def add(self, signature: Signature) -> int:
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for key in band_keys(signature):
+            self._buckets.setdefault(key, []).append(index)
+        return index
+
+    def query(self, signature: Signature, threshold: float = NEAR_DUP_THRESHOLD) -> list[int]:
+        candidates: set[int] = set()
+        for key in band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        return sorted(i for i in candidates if similarity(signature, self._signatures[i]) >= threshold)
+
+
+def cluster_items(items: list[Article], threshold: float = NEAR_DUP_THRESHOLD) -> list[Article]:
+    """거의 같은 기사를 하나로 묶습니다.
+
+    각 묶음은 먼저 나온 항목(발행 시각 역순으로 정렬된 경우 가장 최근 것)을
+    대표로 남기고, 대표의 ``sources``에 묶인 모든 항목의 출처와 링크를 더합니다.
+    대표 항목에는 이후 저장소 비교에 쓰도록 ``signature``를 채웁니다.
+
+    항목은 대표와 비교해 ``threshold`` 이상인 가장 비슷한 묶음에 들어갑니다.
+    묶인 항목끼리는 비교하지 않으므로 조금씩 다른 기사들이 사슬처럼 이어져
+    서로 관계없는 기사까지 한 묶음이 되지 않습니다.
+    """
+    index = LSHIndex()  # 대표 항목만 넣으므로 인덱스 번호가 곧 clusters 번호입니다.
+    clusters: list[Article] = []
+    signatures: list[Signature] = []
+    for item in items:
+        signature = item.signature or item_signature(item)
+        matches = index.query(signature, threshold)
+        if matches:
+            best = max(matches, key=lambda i: similarity(signature, signatures[i]))
+            clusters[best].sources.extend(item.sources)
+        else:
+            item.signature = signature
+            clusters.append(item)
+            signatures.append(signature)
+            index.add(signature)
+    return clusters
@@ -0,0 +1,303 @@
+"""Optional full-text extraction of the article pages linked from feed items.
+
+피드 요약만으로는 기사의 중요도를 판단하기 어려우므로, 선택된 기사들의 원문
+페이지를 받아 본문을 추출해 ``Article.body``에 채웁니다.
+
+- 스레드 풀(``EXTRACT_MAX_WORKERS``)에서 여러 페이지를 동시에 가져오되, 호스트마다
+  동시 요청 수(``EXTRACT_PER_HOST``)와 요청 시작 간격(``EXTRACT_HOST_DELAY``초)을
+  제한합니다. 같은 호스트의 URL이 몰려 있어도 다른 호스트 요청이 밀리지 않도록
+  호스트를 번갈아 가며 작업을 넣습니다.
+- 전체 마감 시간(``EXTRACT_DEADLINE``초)이 지나면 끝나지 않은 페이지는 건너뜁니다.
+- 추출 결과는 URL별로 ``NEWSLETTER_CACHE_DIR/pages``에 저장해
+  ``EXTRACT_CACHE_TTL``초 동안 다시 받지 않습니다. 실패도 짧게(``EXTRACT_FAILURE_TTL``)
+  기억해 깨진 페이지를 매번 기다리지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.parse import urlsplit
+
+from newsletter_article import Article
+from newsletter_feeds import CACHE_DIR, make_session
+from newsletter_text import html_to_text
+
+EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "8"))
+EXTRACT_PER_HOST = int(os.getenv("EXTRACT_PER_HOST", "2"))
+EXTRACT_HOST_DELAY = float(os.getenv("EXTRACT_HOST_DELAY", "0.5"))
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "10"))
+EXTRACT_DEADLINE = float(os.getenv("EXTRACT_DEADLINE", "20"))
+EXTRACT_CACHE_TTL = float(os.getenv("EXTRACT_CACHE_TTL", str(7 * 24 * 3600)))
+EXTRACT_FAILURE_TTL = float(os.getenv("EXTRACT_FAILURE_TTL", "3600"))
+# 페이지 하나에서 읽을 최대 바이트 수와 보관할 본문 최대 글자 수
+EXTRACT_MAX_BYTES = 2 * 1024 * 1024
+EXTRACT_MAX_CHARS = 20_000
+
+# 본문이 아닌 영역 (안의 텍스트를 모두 버림)
+_SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "button",
+    "iframe", "select",
+})
+# 문단 단위로 모으는 요소
+_BLOCK_TAGS = frozenset({"p", "h1", "h2", "h3", "h4", "li", "blockquote", "pre", "td"})
+# 본문 영역이 따로 없을 때 이 길이보다 짧은 블록은 메뉴나 버튼 글자로 봅니다.
+_MIN_BLOCK_CHARS = 40
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+
+
+class _MainTextParser(HTMLParser):
+    """``<article>``/``<main>`` 안의 문단을 우선으로 본문 블록을 모읍니다."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: list[tuple[str, bool]] = []  # (텍스트, 본문 영역 안인지)
+        self.meta_description = ""
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._current: list[str] | None = None
+
+    def _flush(self) -> None:
+        if self._current is not None:
+            text = " ".join("".join(self._current).split())
+            if text:
+                self.blocks.append((text, self._main_depth > 0))
+            self._current = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "meta":
+            values = dict(attrs)
+            if (values.get("property") or values.get("name") or "").lower() in ("og:description", "description"):
+                self.meta_description = self.meta_description or (values.get("content") or "").strip()
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in ("article", "main"):
+            self._main_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+            self._current = []
+        elif tag == "br" and self._current is not None:
+            self._current.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in ("article", "main"):
+            self._flush()
+            self._main_depth = max(0, self._main_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if self._current is not None and not self._skip_depth:
+            self._current.append(data)
+
+
+def extract_main_text(html: str, max_chars: int = EXTRACT_MAX_CHARS) -> str:
+    """HTML 문서에서 본문으로 보이는 문단들을 추출합니다.
+
+    ``<article>``이나 ``<main>`` 안의 문단이 있으면 그것만, 없으면 충분히 긴
+    문단들을 사용합니다. 둘 다 없으면 메타 설명을 반환합니다.
+    """
+    parser = _MainTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # 깨진 문서라도 그때까지 모은 블록은 사용합니다.
+        pass
+    parser._flush()
+    main = [text for text, in_main in parser.blocks if in_main]
+    blocks = main if sum(map(len, main)) >= 200 else [
+        text for text, _ in parser.blocks if len(text) >= _MIN_BLOCK_CHARS
+    ]
+    text = "\n".join(blocks) or html_to_text(parser.meta_description)
+    return text[:max_chars]
+
+
+def _decode(body: bytes, content_type: str) -> str:
+    match = re.search(r"charset=([A-Za-z0-9_\-]+)", content_type or "")
+    charset = match.group(1) if match else None
+    if charset is None:
+        sniffed = _CHARSET_RE.search(body[:4096])
+        charset = sniffed.group(1).decode("ascii") if sniffed else "utf-8"
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+class HostThrottle:
+    """호스트별 동시 요청 수와 요청 시작 간격을 제한합니다."""
+
+    def __init__(self, per_host: int = EXTRACT_PER_HOST, delay: float = EXTRACT_HOST_DELAY) -> None:
+        self.per_host = max(1, per_host)
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return semaphore
+
+    def acquire(self, host: str) -> None:
+        self._semaphore(host).acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str) -> None:
+        self._semaphore(host).release()
+
+
+class PageTextCache:
+    """URL별 추출 결과(본문 또는 실패)를 디스크에 보관합니다."""
+
+    def __init__(self, directory: Path, ttl: float = EXTRACT_CACHE_TTL, failure_ttl: float = EXTRACT_FAILURE_TTL) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        try:
+            entry = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        ttl = self.ttl if entry.get("error") is None else self.failure_ttl
+        if entry.get("url") != url or time.time() - entry.get("fetched_at", 0) > ttl:
+            return None
+        return entry
+
+    def put(self, url: str, text: str, error: str | None = None) -> None:
+        path = self._path(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps({"url": url, "fetched_at": time.time(), "text": text, "error": error}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+
+PAGE_CACHE = PageTextCache(CACHE_DIR / "pages") if os.getenv("EXTRACT_CACHE", "1") != "0" else None
+
+_SESSION = make_session(EXTRACT_MAX_WORKERS)
+
+
+def fetch_page_text(url: str, throttle: HostThrottle, timeout: float = EXTRACT_TIMEOUT) -> str:
+    """페이지 하나를 받아 본문을 추출합니다. 최대 ``EXTRACT_MAX_BYTES``까지만 읽습니다."""
+    host = urlsplit(url).hostname or ""
+    throttle.acquire(host)
+    try:
+        response = _SESSION.get(url, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if "html" not in content_type and "xml" not in content_type:
+                raise ValueError(f"HTML 문서가 아닙니다: {content_type or '알 수 없는 형식'}")
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= EXTRACT_MAX_BYTES:
+                    break
+        finally:
+            response.close()
+    finally:
+        throttle.release(host)
+    return extract_main_text(_decode(b"".join(chunks), content_type))
+
+
+def _interleave_by_host(articles: list[Article]) -> list[Article]:
+    # 호스트별 대기열에서 하나씩 번갈아 꺼내 한 호스트가 워커를 독차지하지 않게 합니다.
+    queues: dict[str, deque[Article]] = defaultdict(deque)
+    for article in articles:
+        queues[urlsplit(article.link).hostname or ""].append(article)
+    ordered = []
+    while queues:
+        for host in list(queues):
+            ordered.append(queues[host].popleft())
+            if not queues[host]:
+                del queues[host]
+    return ordered
+
+
+def extract_articles(
+    articles: Iterable[Article],
+    deadline: float = EXTRACT_DEADLINE,
+    max_workers: int = EXTRACT_MAX_WORKERS,
+    throttle: HostThrottle | None = None,
+    cache: PageTextCache | None = PAGE_CACHE,
+) -> dict[str, str]:
+    """기사들의 원문 본문을 추출해 ``Article.body``에 채웁니다.
+
+    Args:
+        articles: 본문을 채울 기사들 (링크가 없거나 이미 본문이 있으면 건너뜀)
+        deadline: 전체 마감 시간(초)
+        max_workers: 동시에 가져올 최대 페이지 수
+        throttle: 호스트별 제한 (None이면 기본 설정으로 새로 만듦)
+        cache: 추출 결과 캐시 (None이면 항상 새로 받음)
+
+    Returns:
+        실패한 기사 링크별 오류 메시지
+    """
+    errors: dict[str, str] = {}
+    pending = []
+    for article in articles:
+        if not article.link or article.body:
+            continue
+        entry = cache.get(article.link) if cache else None
+        if entry is None:
+            pending.append(article)
+        elif entry.get("error"):
+            errors[article.link] = entry["error"]
+        else:
+            article.body = entry.get("text") or ""
+    if not pending:
+        return errors
+
+    throttle = throttle or HostThrottle()
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)), thread_name_prefix="extract")
+    try:
+        futures = {
+            executor.submit(fetch_page_text, article.link, throttle): article
+            for article in _interleave_by_host(pending)
+        }
+        done, not_done = wait(futures, timeout=deadline)
+        for future in done:
+            article = futures[future]
+            try:
+                article.body = future.result()
+            except Exception as e:
+                errors[article.link] = str(e)
+                if cache:
+                    cache.put(article.link, "", error=str(e))
+            else:
+                if cache:
+                    cache.put(article.link, article.body)
+        for future in not_done:
+            errors[futures[future].link] = f"마감 시간 {deadline:.0f}초 초과"
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return errors
@@ -0,0 +1,595 @@
+"""RSS/Atom/JSON Feed registry and concurrent fetcher used by ``fetch_tech_news``.
+
+피드 목록은 ``NEWS_FEEDS`` (쉼표/줄바꿈으로 구분한 ``이름=URL`` 또는 URL)나
+``NEWS_FEEDS_FILE`` (``[{"name", "url", "timeout", "weight"}]`` 형태의 JSON 파일)로
+설정합니다. 설정이 없으면 TechCrunch AI 피드 하나를 사용합니다.
+
+모든 피드는 스레드 풀에서 동시에 가져오며, 피드별 타임아웃과 전체 마감
+시간(deadline)을 함께 적용하므로 피드 수가 늘어도 전체 소요 시간은 가장
+느린 피드 하나 수준에 머뭅니다.
+
+응답은 ``NEWSLETTER_CACHE_DIR``(기본값 ``.newsletter_cache``) 아래에 ETag,
+Last-Modified와 함께 저장되고, 다음 요청 때 조건부 GET을 보내 304 응답이면
+저장해 둔 파싱 결과를 그대로 사용합니다. ``FEED_CACHE=0``으로 끌 수 있습니다.
+
+계속 실패하는 피드는 회로 차단기(``FeedCircuitBreaker``)가 한동안 요청을 막고,
+그동안은 마지막으로 받은 항목을 ``stale``로 표시해 대신 사용합니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from newsletter_article import Article
+from newsletter_text import summarize_html
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+USER_AGENT = "newsletter-agent/0.1 (+https://github.com/muniv/newsletter_agent_education)"
+
+# 피드 하나의 연결/읽기 타임아웃과 전체 수집 마감 시간(초)
+FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT", "10"))
+FEED_DEADLINE = float(os.getenv("FEED_DEADLINE", "15"))
+FEED_MAX_WORKERS = int(os.getenv("FEED_MAX_WORKERS", "16"))
+# 스트리밍 파싱 시 한 번에 읽는 바이트 수
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# 연속 실패가 이 횟수에 이르면 회로를 열고, 열린 동안은 요청 없이 캐시된 항목을 씁니다.
+FEED_FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "2"))
+# 이보다 오래된 캐시 항목은 실패 시 대체용으로도 쓰지 않습니다.
+FEED_STALE_MAX_AGE = float(os.getenv("FEED_STALE_MAX_AGE", str(3 * 24 * 3600)))
+# 정기 실행 간격(초, 기본 하루). 회로가 열리는 시간의 기본값이 이 간격을 따릅니다.
+FEED_RUN_INTERVAL = float(os.getenv("FEED_RUN_INTERVAL", str(24 * 3600)))
+# 회로가 열려 있는 시간(초). 다시 시도해서 실패할 때마다 두 배로 늘어나며 최대값에서 멈춥니다.
+# 기본값은 다음 정기 실행 한 번을 건너뛰는 시간이며, 최대는 대체 항목을 쓸 수 있는 기간
+# (FEED_STALE_MAX_AGE)을 넘지 않습니다.
+FEED_BACKOFF_BASE = float(os.getenv("FEED_BACKOFF_BASE", str(FEED_RUN_INTERVAL)))
+FEED_BACKOFF_MAX = float(os.getenv("FEED_BACKOFF_MAX", str(min(7 * FEED_RUN_INTERVAL, FEED_STALE_MAX_AGE))))
+# 회로가 열려 있지만 대체할 항목이 없을 때 한 번 시도하는 요청의 제한 시간(초)
+FEED_PROBE_TIMEOUT = float(os.getenv("FEED_PROBE_TIMEOUT", "5"))
+
+CACHE_DIR = Path(os.getenv("NEWSLETTER_CACHE_DIR", ".newsletter_cache"))
+# 저장하는 항목 형식이 바뀌면 올립니다. 형식이 다른 캐시 항목은 무시합니다.
+CACHE_FORMAT = 2
+
+
+@dataclass(frozen=True)
+class Feed:
+    name: str
+    url: str
+    timeout: float = FEED_TIMEOUT
+    # 사전 순위에서 이 피드 기사에 주는 가중치
+    weight: float = 1.0
+
+
+DEFAULT_FEEDS = (
+    Feed("techcrunch-ai", "https://techcrunch.com/category/artificial-intelligence/feed/"),
+)
+
+
+def load_feeds() -> list[Feed]:
+    """환경 변수에서 피드 목록을 읽습니다."""
+    feeds_file = os.getenv("NEWS_FEEDS_FILE")
+    if feeds_file:
+        with open(feeds_file, encoding="utf-8") as f:
+            entries = json.load(f)
+        return [
+            Feed(
+                name=entry.get("name") or urlparse(entry["url"]).netloc,
+                url=entry["url"],
+                timeout=float(entry.get("timeout", FEED_TIMEOUT)),
+                weight=float(entry.get("weight", 1.0)),
+            )
+            for entry in entries
+        ]
+
+    raw = os.getenv("NEWS_FEEDS")
+    if not raw:
+        return list(DEFAULT_FEEDS)
+    feeds = []
+    for spec in re.split(r"[,\n]", raw):
+        spec = spec.strip()
+        if not spec:
+            continue
+        name, sep, url = spec.partition("=")
+        if not sep or name.startswith(("http://", "https://")):
+            name, url = urlparse(spec).netloc, spec
+        feeds.append(Feed(name.strip(), url.strip()))
+    return feeds
+
+
+def make_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+_SESSION = make_session(FEED_MAX_WORKERS)
+
+
+def _text(element: ET.Element | None) -> str:
+    return (element.text or "").strip() if element is not None else ""
+
+
+def _parse_date(value: str) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)  # RSS (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))  # Atom (RFC 3339)
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _atom_link(entry: ET.Element) -> str:
+    for link in entry.findall(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href", "")
+    return ""
+
+
+def _rss_item(item: ET.Element, source: str) -> Article:
+    return Article(
+        title=_text(item.find("title")) or "제목 없음",
+        link=_text(item.find("link")),
+        summary=_text(item.find("description")),
+        published=_parse_date(_text(item.find("pubDate"))),
+        source=source,
+    )
+
+
+def _atom_item(entry: ET.Element, source: str) -> Article:
+    return Article(
+        title=_text(entry.find(f"{ATOM_NS}title")) or "제목 없음",
+        link=_atom_link(entry),
+        summary=_text(entry.find(f"{ATOM_NS}summary")) or _text(entry.find(f"{ATOM_NS}content")),
+        published=_parse_date(
+            _text(entry.find(f"{ATOM_NS}published")) or _text(entry.find(f"{ATOM_NS}updated"))
+        ),
+        source=source,
+    )
+
+
+def _json_feed_item(entry: dict[str, Any], source: str) -> Article:
+    return Article(
+        title=(entry.get("title") or "").strip() or "제목 없음",
+        link=entry.get("url") or entry.get("external_url") or "",
+        summary=entry.get("summary") or entry.get("content_text") or entry.get("content_html") or "",
+        published=_parse_date(entry.get("date_published") or entry.get("date_modified") or ""),
+        source=source,
+    )
+
+
+def _iter_json_feed(chunks: Iterator[bytes], head: bytes, source: str) -> Iterator[Article]:
+    # JSON Feed는 문서 전체를 읽어야 파싱할 수 있습니다.
+    document = json.loads(head + b"".join(chunks))
+    for entry in document.get("items") or []:
+        yield _json_feed_item(entry, source)
+
+
+def iter_feed_items(chunks: Iterable[bytes], source: str) -> Iterator[Article]:
+    """RSS 2.0, Atom, JSON Feed 문서를 조각 단위로 파싱하며 항목을 하나씩 내보냅니다.
+
+    XML 피드는 항목이 완성되는 즉시 내보내고 그 요소를 트리에서 떼어내므로
+    메모리에는 처리 중인 항목 하나만 남습니다. 소비자가 멈추면 나머지 조각은
+    읽지 않습니다. 첫 글자가 ``{``인 문서는 JSON Feed로 처리합니다.
+    """
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if head.lstrip(b"\xef\xbb\xbf \t\r\n"):
+            break
+    if head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"{"):
+        yield from _iter_json_feed(chunks, head, source)
+        return
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: list[ET.Element] = []
+    is_atom: bool | None = None
+    for chunk in itertools.chain((head,), chunks):
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                if is_atom is None:
+                    is_atom = element.tag == f"{ATOM_NS}feed"
+                stack.append(element)
+                continue
+            stack.pop()
+            if element.tag == "item" and not is_atom:
+                yield _rss_item(element, source)
+            elif element.tag == f"{ATOM_NS}entry" and is_atom:
+                yield _atom_item(element, source)
+            else:
+                continue
+            element.clear()
+            if stack:
+                stack[-1].remove(element)
+    parser.close()
+
+
+def parse_feed(content: bytes, source: str, limit: int) -> list[Article]:
+    """RSS 2.0 또는 Atom 문서에서 최대 ``limit``개의 항목을 읽습니다."""
+    return list(itertools.islice(iter_feed_items([content], source), limit))
+
+
+def parse_feed_prefix(content: bytes, source: str, limit: int) -> list[Article]:
+    """앞부분만 남은(조기 종료로 저장된) 문서에서 완성된 항목을 최대 ``limit``개 읽습니다.
+
+    잘린 지점에서 나는 파싱 오류는 무시하고 그때까지 읽은 항목을 돌려줍니다.
+    """
+    items: list[Article] = []
+    try:
+        for item in iter_feed_items([content], source):
+            items.append(item)
+            if len(items) >= limit:
+                break
+    except (ET.ParseError, ValueError):
+        pass
+    return items
+
+
+def _read_items(response: requests.Response, source: str, limit: int) -> tuple[list[Article], bytes, bool]:
+    """스트리밍 응답에서 ``limit``개를 모을 때까지만 읽습니다.
+
+    Returns:
+        (항목 목록, 실제로 읽은 본문 앞부분, 문서 끝까지 읽었는지 여부)
+    """
+    consumed: list[bytes] = []
+
+    def chunks() -> Iterator[bytes]:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            consumed.append(chunk)
+            yield chunk
+
+    try:
+        items = list(itertools.islice(iter_feed_items(chunks(), source), limit))
+    finally:
+        response.close()
+    return items, b"".join(consumed), len(items) < limit
+
+
+def _cached_article(data: dict[str, Any], source: str) -> Article:
+    article = Article.from_dict(data)
+    article.source = source
+    article.sources = [{"source": source, "link": article.link}]
+    return article
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class FeedHTTPCache:
+    """피드 응답 본문, 검증자(ETag/Last-Modified), 파싱 결과를 디스크에 보관합니다.
+
+    URL마다 ``<sha256>.json`` (메타데이터와 파싱된 항목)과 ``<sha256>.body``
+    (응답 본문) 두 파일을 씁니다.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.json", self.directory / f"{digest}.body"
+
+    def load(self, url: str) -> dict[str, Any] | None:
+        meta_path, _ = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url and meta.get("format") == CACHE_FORMAT else None
+
+    def body(self, url: str) -> bytes | None:
+        try:
+            return self._paths(url)[1].read_bytes()
+        except OSError:
+            return None
+
+    @staticmethod
+    def conditional_headers(meta: dict[str, Any] | None) -> dict[str, str]:
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(
+        self,
+        url: str,
+        headers: Any,
+        body: bytes,
+        items: list[Article],
+        complete: bool,
+    ) -> None:
+        """응답을 저장합니다.
+
+        ``body``는 실제로 읽은 본문(조기 종료 시 앞부분)이고, ``complete``는
+        문서 끝까지 읽어 모든 항목을 파싱했는지 여부입니다.
+        """
+        meta_path, body_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(body_path, body)
+        meta = {
+            "url": url,
+            "format": CACHE_FORMAT,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "complete": complete,
+            "items": [item.to_dict() for item in items],
+        }
+        _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def touch(self, url: str, meta: dict[str, Any]) -> None:
+        """304 응답으로 저장된 결과가 여전히 최신임을 확인한 시각을 기록합니다."""
+        meta = {**meta, "fetched_at": datetime.now(timezone.utc).isoformat()}
+        _write_atomic(self._paths(url)[0], json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def stale_items(self, feed: Feed, limit: int, max_age: float = FEED_STALE_MAX_AGE) -> list[Article]:
+        """마지막으로 성공한 응답의 항목을 ``stale`` 표시와 함께 돌려줍니다."""
+        meta = self.load(feed.url)
+        if not meta or not meta.get("fetched_at"):
+            return []
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(meta["fetched_at"])
+        if age.total_seconds() > max_age:
+            return []
+        items = [_cached_article(item, feed.name) for item in (meta.get("items") or [])[:limit]]
+        for item in items:
+            item.stale = True
+        return items
+
+
+FEED_CACHE = FeedHTTPCache(CACHE_DIR / "feeds") if os.getenv("FEED_CACHE", "1") != "0" else None
+
+
+def fetch_feed(feed: Feed, limit: int, cache: FeedHTTPCache | None = FEED_CACHE) -> list[Article]:
+    """피드 하나를 가져와 파싱합니다.
+
+    응답은 스트리밍으로 읽으며 ``limit``개를 모으면 나머지는 받지 않습니다.
+    캐시가 있으면 조건부 GET을 보내고, 304 응답이면 저장된 파싱 결과(부족하면
+    저장된 본문)를 사용합니다.
+    """
+    meta = cache.load(feed.url) if cache else None
+    response = _SESSION.get(
+        feed.url, timeout=feed.timeout, headers=FeedHTTPCache.conditional_headers(meta), stream=True
+    )
+    if response.status_code == 304 and cache and meta:
+        response.close()
+        cached_items = meta.get("items") or []
+        if meta.get("complete") or len(cached_items) >= limit:
+            cache.touch(feed.url, meta)
+            return [_cached_article(item, feed.name) for item in cached_items[:limit]]
+        body = cache.body(feed.url)
+        if body is not None:
+            items = parse_feed_prefix(body, feed.name, limit)
+            if len(items) >= limit:
+                return items
+        # 저장된 본문이 없거나 앞부분만 있으면 검증자 없이 다시 받습니다.
+        response = _SESSION.get(feed.url, timeout=feed.timeout, stream=True)
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
+    items, body, complete = _read_items(response, feed.name, limit)
+    if cache:
+        cache.store(feed.url, response.headers, body, items, complete)
+    return items
+
+
+class FeedCircuitBreaker:
+    """피드별 연속 실패 횟수를 기록하고, 계속 실패하는 피드는 잠시 요청하지 않습니다.
+
+    닫힘(정상) → 연속 실패가 ``threshold``에 이르면 열림 → 열린 시간이 지나면
+    반열림(한 번만 시도) → 성공하면 닫힘, 실패하면 더 긴 시간 동안 다시 열림.
+    상태는 JSON 파일에 저장되어 다음 실행에도 이어집니다.
+    """
+
+    def __init__(
+        self,
+        path: Path | None,
+        threshold: int = FEED_FAILURE_THRESHOLD,
+        backoff_base: float = FEED_BACKOFF_BASE,
+        backoff_max: float = FEED_BACKOFF_MAX,
+    ) -> None:
+        self.path = path
+        self.threshold = max(1, threshold)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._state: dict[str, dict[str, Any]] | None = None
+        self._probing: set[str] = set()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._state is None:
+            try:
+                self._state = json.loads(self.path.read_text(encoding="utf-8")) if self.path else {}
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save(self) -> None:
+        if self.path is None or self._state is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.path, json.dumps(self._state, ensure_ascii=False).encode("utf-8"))
+
+    def retry_at(self, url: str) -> float | None:
+        """회로가 열려 있으면 다시 시도할 수 있는 시각(epoch 초)."""
+        with self._lock:
+            entry = self._load().get(url)
+        if not entry or entry.get("open_until", 0) <= time.time():
+            return None
+        return entry["open_until"]
+
+    def allow(self, url: str) -> bool:
+        """지금 요청해도 되는지 확인합니다. 반열림 상태에서는 한 호출만 허용합니다."""
+        with self._lock:
+            entry = self._load().get(url)
+            if not entry or entry.get("failures", 0) < self.threshold:
+                return True
+            if entry.get("open_until", 0) > time.time() or url in self._probing:
+                return False
+            self._probing.add(url)
+            return True
+
+    def force_probe(self, url: str) -> bool:
+        """열린 시간이 남아 있어도 반열림 시도 한 번을 허용합니다 (대체할 항목이 없을 때).
+
+        이미 다른 호출이 시도 중이면 False입니다.
+        """
+        with self._lock:
+            if url in self._probing:
+                return False
+            self._probing.add(url)
+            return True
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            self._probing.discard(url)
+            state = self._load()
+            if state.pop(url, None) is not None:
+                self._save()
+
+    def record_failure(self, url: str, error: str) -> None:
+        with self._lock:
+            self._probing.discard(url)
+            entry = self._load().setdefault(url, {"failures": 0})
+            entry["failures"] = entry.get("failures", 0) + 1
+            entry["last_error"] = error
+            if entry["failures"] >= self.threshold:
+                backoff = self.backoff_base * 2 ** (entry["failures"] - self.threshold)
+                entry["open_until"] = time.time() + min(self.backoff_max, backoff)
+            self._save()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {url: dict(entry) for url, entry in self._load().items()}
+
+
+FEED_BREAKER = FeedCircuitBreaker(CACHE_DIR / "feed_health.json") if os.getenv("FEED_BREAKER", "1") != "0" else None
+
+
+def _fallback(feed: Feed, limit: int, cache: FeedHTTPCache | None, reason: str) -> tuple[list[Article], str]:
+    stale = cache.stale_items(feed, limit) if cache else []
+    if stale:
+        return stale, f"{reason} (마지막으로 받은 항목 {len(stale)}개 사용)"
+    return [], reason
+
+
+def fetch_feeds(
+    feeds: list[Feed],
+    limit: int,
+    deadline: float = FEED_DEADLINE,
+    max_workers: int = FEED_MAX_WORKERS,
+    cache: FeedHTTPCache | None = FEED_CACHE,
+    breaker: FeedCircuitBreaker | None = FEED_BREAKER,
+) -> tuple[list[Article], dict[str, str]]:
+    """여러 피드를 동시에 가져와 발행 시각 역순으로 합칩니다.
+
+    실패했거나 회로가 열려 있는 피드는 캐시에 남은 마지막 항목을 ``stale``로
+    표시해 대신 사용하고, 그 사실을 오류 메시지에 남깁니다. 회로가 열려 있어도
+    대신할 항목이 없으면 ``FEED_PROBE_TIMEOUT``초 제한으로 한 번 시도합니다.
+
+    Args:
+        feeds: 가져올 피드 목록
+        limit: 피드마다 읽을 최대 항목 수
+        deadline: 전체 마감 시간(초). 그때까지 끝나지 않은 피드는 건너뜁니다.
+        max_workers: 동시에 가져올 최대 피드 수
+        cache: 조건부 GET과 실패 시 대체에 사용할 캐시 (None이면 매번 전체를 받음)
+        breaker: 피드별 회로 차단기 (None이면 항상 요청)
+
+    Returns:
+        (합쳐진 항목 목록, 실패한 피드 이름별 오류 메시지)
+    """
+    items: list[Article] = []
+    errors: dict[str, str] = {}
+    if not feeds:
+        return items, errors
+
+    def fail(feed: Feed, reason: str) -> None:
+        stale, errors[feed.name] = _fallback(feed, limit, cache, reason)
+        items.extend(stale)
+
+    active = []
+    for feed in feeds:
+        if not breaker or breaker.allow(feed.url):
+            active.append(feed)
+        elif not (cache and cache.stale_items(feed, 1)) and breaker.force_probe(feed.url):
+            # 대체할 항목도 없으면 쉬는 중이어도 짧은 제한 시간으로 한 번 시도합니다.
+            active.append(replace(feed, timeout=min(feed.timeout, FEED_PROBE_TIMEOUT)))
+        else:
+            retry_at = breaker.retry_at(feed.url)
+            when = datetime.fromtimestamp(retry_at).strftime("%m-%d %H:%M") if retry_at else "잠시 후"
+            fail(feed, f"연속 실패로 요청을 쉬는 중 ({when} 이후 재시도)")
+    if not active:
+        return _sorted(items), errors
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(active)), thread_name_prefix="feed")
+    try:
+        futures = {executor.submit(fetch_feed, feed, limit, cache): feed for feed in active}
+        done, not_done = wait(futures, timeout=deadline)
+        for future in done:
+            feed = futures[future]
+            try:
+                items.extend(future.result())
+            except Exception as e:
+                if breaker:
+                    breaker.record_failure(feed.url, str(e))
+                fail(feed, str(e))
+            else:
+                if breaker:
+                    breaker.record_success(feed.url)
+        for future in not_done:
+            feed = futures[future]
+            reason = f"마감 시간 {deadline:.0f}초 초과"
+            if breaker:
+                breaker.record_failure(feed.url, reason)
+            fail(feed, reason)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return _sorted(items), errors
+
+
+def _sorted(items: list[Article]) -> list[Article]:
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    items.sort(key=lambda item: item.published or oldest, reverse=True)
+    return items
+
+
+def format_items(items: list[Article]) -> str:
+    """항목을 에이전트가 읽는 텍스트 형식으로 만듭니다."""
+    news_list = []
+    for item in items:
+        entry = f"📰 {item.title}\n🔗 {item.link}\n📝 {summarize_html(item.summary)}\n"
+        sources = item.sources
+        if len(sources) > 1:
+            entry += f"🗂️ {len(sources)}개 매체 보도: {', '.join(sorted({str(s['source']) for s in sources}))}\n"
+        news_list.append(entry)
+    return "\n".join(news_list)
@@ -0,0 +1,157 @@
+"""CrewAI LLM wrapper that serves completions from ``newsletter_llm_cache``.
+
+모든 호출의 지연 시간, 토큰 수, 추정 비용을 에이전트(역할) 이름으로
+``newsletter_metrics.LLM_USAGE``에 기록합니다.
+
+crewai를 불러오므로 ``newsletter_crew``는 에이전트를 만들 때에만 이 모듈을
+import합니다.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+
+from newsletter_client import estimate_tokens
+from newsletter_llm_cache import LLM_CACHE, CompletionCache
+from newsletter_metrics import LLM_USAGE
+
+
+def _messages(messages: Any) -> list[dict[str, Any]]:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return [dict(message) for message in messages]
+
+
+def _encode_response(response: Any) -> Any:
+    # 구조화 출력(pydantic 모델)은 dict로 저장하고 꺼낼 때 다시 검증합니다.
+    if hasattr(response, "model_dump"):
+        return {"model": response.model_dump(mode="json")}
+    return {"text": response}
+
+
+def _decode_response(value: dict[str, Any], response_model: Any) -> Any:
+    if "model" in value and response_model is not None:
+        return response_model.model_validate(value["model"])
+    return value.get("text", value.get("model"))
+
+
+def _provider_usage(llm: Any) -> tuple[int, int]:
+    # 공급자가 알려 준 누적 (입력, 출력) 토큰 수. 지원하지 않는 crewai 버전이면 0입니다.
+    try:
+        usage = llm.get_token_usage_summary()
+    except Exception:
+        return 0, 0
+    return int(getattr(usage, "prompt_tokens", 0) or 0), int(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def _estimated_usage(messages: Any, response: Any) -> tuple[int, int]:
+    prompt = "\n".join(str(message.get("content") or "") for message in _messages(messages))
+    return estimate_tokens(prompt), estimate_tokens(str(response))
+
+
+class CachedLLM(BaseLLM):
+    """실제 LLM 호출 앞에 디스크 완성 캐시를 두고, 호출마다 사용량을 ``agent`` 이름으로 기록합니다.
+
+    에이전트 실행기가 설정하는 ``stop`` 단어는 호출할 때 안쪽 LLM에 옮기고
+    키에도 넣습니다. 캐시에 없으면 안쪽 LLM을 그대로 부르므로 이벤트와
+    토큰 사용량 집계는 실제 호출에 대해서만 남습니다.
+
+    토큰 수는 안쪽 LLM의 누적 사용량 차이로 구하되, 같은 객체로 동시에 다른
+    호출이 진행된 경우(fanout)에는 차이를 나눌 수 없으므로 글자 수로 추정합니다.
+    """
+
+    def __init__(self, inner: LLM, cache: CompletionCache, agent: str = "default") -> None:
+        super().__init__(model=inner.model, temperature=getattr(inner, "temperature", None))
+        self.inner = inner
+        self.cache = cache
+        self.agent = agent
+        self.stop = list(getattr(inner, "stop", None) or [])
+        self._usage_lock = threading.Lock()
+        self._in_flight = 0
+        self._overlaps = 0
+
+    def _request(self, messages: Any, tools: Any, available_functions: Any, response_model: Any) -> dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": _messages(messages),
+            "tools": tools or [],
+            "temperature": self.temperature,
+            "stop": sorted(self.stop or []),
+            "functions": sorted(available_functions or []),
+            "response_model": response_model.model_json_schema() if response_model is not None else None,
+        }
+
+    def call(
+        self,
+        messages: Any,
+        tools: list[dict[str, Any]] | None = None,
+        callbacks: list[Any] | None = None,
+        available_functions: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        start = time.perf_counter()
+        response_model = kwargs.get("response_model")
+        request = self._request(messages, tools, available_functions, response_model)
+        key = self.cache.key("completion", request)
+        # rw 모드에서 도구 함수를 직접 실행하는 호출은 부작용을 건너뛰지 않도록 항상 새로 부릅니다.
+        hit, value = self.cache.lookup(key, readable=not available_functions or self.cache.mode != "rw")
+        if hit:
+            LLM_USAGE.observe(self.agent, self.model, time.perf_counter() - start, cached=True)
+            return _decode_response(value, response_model)
+
+        with self._usage_lock:
+            self._in_flight += 1
+            started_alone = self._in_flight == 1
+            if not started_alone:
+                self._overlaps += 1
+            overlaps = self._overlaps
+            before = _provider_usage(self.inner)
+        try:
+            self.inner.stop = self.stop
+            response = self.inner.call(
+                messages, tools=tools, callbacks=callbacks, available_functions=available_functions, **kwargs
+            )
+        except Exception:
+            with self._usage_lock:
+                self._in_flight -= 1
+            LLM_USAGE.observe(self.agent, self.model, time.perf_counter() - start, error=True)
+            raise
+        with self._usage_lock:
+            self._in_flight -= 1
+            after = _provider_usage(self.inner)
+            # 혼자 시작했고 그 뒤로 시작한 호출도 없어야 누적 사용량 차이가 이 호출의 것입니다.
+            alone = started_alone and overlaps == self._overlaps
+        prompt_tokens, completion_tokens = after[0] - before[0], after[1] - before[1]
+        estimated = not alone or prompt_tokens + completion_tokens <= 0
+        if estimated:
+            prompt_tokens, completion_tokens = _estimated_usage(messages, response)
+        LLM_USAGE.observe(
+            self.agent, self.model, time.perf_counter() - start, prompt_tokens, completion_tokens, estimated=estimated
+        )
+        self.cache.store(key, request, _encode_response(response))
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+
+def make_llm(model_name: str, agent: str = "default", cache: CompletionCache = LLM_CACHE, **kwargs: Any) -> BaseLLM:
+    """``agent`` 이름으로 사용량을 기록하고 캐시(``LLM_CACHE_MODE``)를 거치는 LLM을 만듭니다.
+
+    ``kwargs``(예: ``timeout``)는 crewai ``LLM``에 그대로 전달합니다.
+    """
+    # replay 모드는 실제로 호출하지 않으므로 API 키가 없어도 LLM 객체를 만들 수 있게 합니다.
+    api_key = os.getenv("OPENAI_API_KEY") or ("replay" if cache.replaying else None)
+    return CachedLLM(LLM(model=model_name, api_key=api_key, **kwargs), cache, agent)
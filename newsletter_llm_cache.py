@@ -0,0 +1,236 @@
+"""Content-addressed on-disk cache for LLM completions and MCP tool results.
+
+크루를 다시 실행할 때(예: 발송 단계 실패 후 재시도) 이미 끝난 뉴스 수집과
+편집 단계의 LLM 호출을 다시 하지 않도록, 완성 결과를 요청 내용의 해시로
+``NEWSLETTER_CACHE_DIR/llm``에 저장합니다. 키는 모델, 메시지, 도구 스키마,
+temperature, stop 단어를 정렬된 JSON으로 만든 뒤의 sha256입니다.
+
+캐시 모드 (환경 변수 ``LLM_CACHE_MODE`` 또는 ``--llm-cache``):
+    rw: 캐시에 있으면 재사용하고, 없으면 호출한 뒤 저장 (기본값).
+        발송하지 못한 실행을 이어서 할 때는 그 실행의 부작용 없는 도구
+        결과(뉴스 수집 등)도 기록에서 꺼내 프롬프트를 똑같이 만듭니다.
+    record: 항상 새로 호출하고 결과와 도구 결과를 모두 저장
+    replay: 저장된 결과만 사용. 캐시에 없는 호출은 ``ReplayMissError``.
+        MCP 도구 결과도 기록에서 꺼내므로 네트워크 없이 지난 실행을 재현합니다.
+        이메일도 실제로 보내지 않고 기록된 결과를 돌려줍니다.
+    off: 캐시를 쓰지 않음
+
+LLM이 직접 도구 함수를 실행하는 호출(``available_functions``)은 부작용을
+다시 일으켜야 하므로 rw 모드에서는 캐시하지 않습니다.
+
+도구 결과는 실행(run) id별로 기록되므로 다른 날의 실행이 지난 뉴스를 받지
+않습니다. 저장 항목은 ``LLM_CACHE_TTL_DAYS``일(기본 14일)이 지나거나 전체
+크기가 ``LLM_CACHE_MAX_MB``(기본 200MB)를 넘으면 오래된 것부터 지웁니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from newsletter_client import NON_IDEMPOTENT_TOOLS, SIDE_EFFECT_TOOLS
+from newsletter_feeds import CACHE_DIR
+
+LLM_CACHE_MODES = ("rw", "record", "replay", "off")
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "14"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "200"))
+# 저장할 때 오래된 항목 정리를 이 간격(초)보다 자주 하지 않습니다.
+PRUNE_INTERVAL = 3600.0
+
+
+class ReplayMissError(RuntimeError):
+    """replay 모드에서 기록되지 않은 호출을 만났습니다."""
+
+
+def _canonical(payload: Any) -> str:
+    return json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class CompletionCache:
+    """요청 해시를 파일 이름으로 쓰는 JSON 캐시와 재현용 실행 기록.
+
+    LLM 완성과 MCP 도구 결과가 같은 디렉터리를 쓰며, 항목 종류(``kind``)가
+    키에 포함되므로 서로 겹치지 않습니다.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        mode: str = "rw",
+        ttl: float = LLM_CACHE_TTL_DAYS * 86400,
+        max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024),
+    ) -> None:
+        self.directory = directory
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # 도구 결과 기록의 범위. begin_run/resume_run이 정합니다.
+        self.run_id: str | None = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._last_prune = 0.0
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str) -> None:
+        mode = mode.lower()
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(f"알 수 없는 LLM 캐시 모드입니다: {mode} (가능한 값: {', '.join(LLM_CACHE_MODES)})")
+        self._mode = mode
+
+    @property
+    def enabled(self) -> bool:
+        return self._mode != "off"
+
+    @property
+    def replaying(self) -> bool:
+        return self._mode == "replay"
+
+    @staticmethod
+    def key(kind: str, request: dict[str, Any]) -> str:
+        return hashlib.sha256(f"{kind}\n{_canonical(request)}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def lookup(self, key: str, readable: bool = True) -> tuple[bool, Any]:
+        """``(적중 여부, 값)``을 반환합니다. replay 모드의 미스는 예외입니다."""
+        if self._mode in ("off", "record") or not readable:
+            return False, None
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entry = None
+        if entry is None or entry.get("key") != key:
+            self._count("misses")
+            if self.replaying:
+                raise ReplayMissError(f"❌ replay 모드인데 캐시에 없는 호출입니다 (키 {key[:12]})")
+            return False, None
+        self._count("hits")
+        return True, entry["value"]
+
+    def store(self, key: str, request: dict[str, Any], value: Any) -> None:
+        if self._mode not in ("rw", "record"):
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            _canonical({"key": key, "created_at": time.time(), "request": request, "value": value}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+        self._count("writes")
+        if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+            self._last_prune = time.monotonic()
+            self.prune()
+
+    def prune(self) -> int:
+        """TTL이 지난 항목을 지우고, 남은 크기가 ``max_bytes``를 넘으면 오래된 것부터 지웁니다.
+
+        지운 항목 수를 반환합니다. 실행 기록(``last_run.json``)은 지우지 않습니다.
+        """
+        entries = []
+        for path in self.directory.glob("??/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        cutoff = time.time() - self.ttl
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._counters["evictions"] += removed
+        return removed
+
+    # newsletter_client.set_tape가 요구하는 인터페이스
+
+    def _tool_request(self, tool_name: str, arguments: dict[str, Any], encoding: str | None) -> dict[str, Any]:
+        return {"run": self.run_id, "tool": tool_name, "arguments": arguments, "encoding": encoding}
+
+    def replay(self, tool_name: str, arguments: dict[str, Any], encoding: str | None) -> tuple[bool, Any]:
+        """기록된 도구 결과를 돌려줍니다. 기록을 쓰지 않는 호출은 ``(False, None)``입니다.
+
+        replay 모드는 모든 도구를, 지난 실행을 이어서 하는 rw 모드는
+        ``SIDE_EFFECT_TOOLS``가 아닌 도구만 기록에서 꺼냅니다. 이메일 발송과
+        기사 기록은 rw 모드에서 항상 실제로 실행됩니다.
+        """
+        if self.replaying:
+            return self.lookup(self.key("tool", self._tool_request(tool_name, arguments, encoding)))
+        if self._mode != "rw" or self.run_id is None or tool_name in SIDE_EFFECT_TOOLS:
+            return False, None
+        return self.lookup(self.key("tool", self._tool_request(tool_name, arguments, encoding)))
+
+    def record(self, tool_name: str, arguments: dict[str, Any], encoding: str | None, value: Any) -> None:
+        request = self._tool_request(tool_name, arguments, encoding)
+        self.store(self.key("tool", request), request, value)
+        if tool_name in NON_IDEMPOTENT_TOOLS and isinstance(value, str) and value.startswith("✅"):
+            self.complete_run()
+
+    # 재현에 필요한 실행 인자 (수신자, 모델, 편집·발송 방식, 날짜)와 실행 id
+
+    def _write_run(self, run: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / "last_run.json"
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(_canonical(run), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def begin_run(self, run: dict[str, Any]) -> dict[str, Any]:
+        """새 실행 id를 정하고 실행 기록에 저장합니다 (rw/record 모드)."""
+        run = {**run, "run_id": uuid.uuid4().hex[:12], "completed": False}
+        self.run_id = run["run_id"]
+        if self._mode in ("rw", "record"):
+            self._write_run(run)
+        return run
+
+    def resume_run(self, run: dict[str, Any]) -> None:
+        """기록된 실행의 도구 결과를 다시 쓰도록 그 실행 id를 씁니다."""
+        self.run_id = run.get("run_id")
+
+    def complete_run(self) -> None:
+        """현재 실행을 발송 완료로 기록합니다. 완료된 실행은 rw 모드에서 이어서 하지 않습니다."""
+        if self._mode not in ("rw", "record"):
+            return
+        run = self.last_run()
+        if run is not None and run.get("run_id") == self.run_id and not run.get("completed"):
+            self._write_run({**run, "completed": True})
+
+    def last_run(self) -> dict[str, Any] | None:
+        try:
+            return json.loads((self.directory / "last_run.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+LLM_CACHE = CompletionCache(
+    Path(os.getenv("LLM_CACHE_DIR") or CACHE_DIR / "llm"), os.getenv("LLM_CACHE_MODE", "rw")
+)
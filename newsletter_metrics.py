@@ -0,0 +1,386 @@
+"""Per-tool latency/payload metrics shared by the MCP client and server.
+
+표준 라이브러리와 (fastmcp가 이미 의존하는) pydantic_core만 사용하므로 크루와 서버 어느 쪽에서 불러와도 가볍습니다.
+클라이언트(``side="client"``)와 서버(``side="server"``)의 도구 호출을 각각
+지연 시간 히스토그램, 결과 크기 히스토그램, 호출/오류 수로 기록하고
+Prometheus 텍스트 형식이나 JSON 요약으로 내보냅니다.
+
+에이전트별 LLM 호출(지연 시간, 토큰 수, 추정 비용)은 ``LLM_USAGE``에 따로 기록합니다.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, TypeVar
+
+import pydantic_core
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram과 같은 의미)."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """버킷 상한으로 근사한 분위수. 관측값이 없으면 None입니다."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        result, seen = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            result.append((_format_bound(bound), seen))
+        result.append(("+Inf", self.count))
+        return result
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() and bound >= 1 else repr(float(bound))
+
+
+class _Series:
+    __slots__ = ("latency", "payload", "calls", "errors")
+
+    def __init__(self) -> None:
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.payload = Histogram(PAYLOAD_BUCKETS)
+        self.calls = 0
+        self.errors = 0
+
+
+class ToolMetrics:
+    """(side, tool)별 지연 시간, 결과 크기, 호출/오류 수를 기록합니다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], _Series] = {}
+
+    def observe(
+        self,
+        side: str,
+        tool: str,
+        seconds: float,
+        payload_bytes: int | None = None,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            series = self._series.get((side, tool))
+            if series is None:
+                series = self._series[(side, tool)] = _Series()
+            series.calls += 1
+            series.errors += int(error)
+            series.latency.observe(seconds)
+            if payload_bytes is not None:
+                series.payload.observe(payload_bytes)
+
+    def summary(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """``{side: {tool: {...}}}`` 형태의 JSON 직렬화 가능한 요약."""
+        with self._lock:
+            result: dict[str, dict[str, dict[str, Any]]] = {}
+            for (side, tool), series in sorted(self._series.items()):
+                latency, payload = series.latency, series.payload
+                result.setdefault(side, {})[tool] = {
+                    "calls": series.calls,
+                    "errors": series.errors,
+                    "latency_ms": {
+                        "mean": round(latency.sum / latency.count * 1000, 3) if latency.count else None,
+                        "p50_le": _ms(latency.quantile(0.5)),
+                        "p95_le": _ms(latency.quantile(0.95)),
+                        "total": round(latency.sum * 1000, 3),
+                    },
+                    "payload_bytes": {
+                        "total": int(payload.sum),
+                        "mean": round(payload.sum / payload.count) if payload.count else None,
+                        "p95_le": payload.quantile(0.95),
+                    },
+                }
+            return result
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식으로 내보냅니다."""
+        lines = [
+            "# HELP newsletter_tool_calls_total MCP tool calls.",
+            "# TYPE newsletter_tool_calls_total counter",
+        ]
+        with self._lock:
+            items = sorted(self._series.items())
+            for (side, tool), series in items:
+                lines.append(f'newsletter_tool_calls_total{{side="{side}",tool="{tool}"}} {series.calls}')
+            lines += [
+                "# HELP newsletter_tool_errors_total MCP tool calls that raised an error.",
+                "# TYPE newsletter_tool_errors_total counter",
+            ]
+            for (side, tool), series in items:
+                lines.append(f'newsletter_tool_errors_total{{side="{side}",tool="{tool}"}} {series.errors}')
+            for metric, attr, help_text in (
+                ("newsletter_tool_latency_seconds", "latency", "MCP tool call latency."),
+                ("newsletter_tool_payload_bytes", "payload", "Size of MCP tool results."),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for (side, tool), series in items:
+                    histogram: Histogram = getattr(series, attr)
+                    labels = f'side="{side}",tool="{tool}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _ms(seconds: float | None) -> float | None:
+    if seconds is None or seconds == float("inf"):
+        return seconds
+    return round(seconds * 1000, 3)
+
+
+def payload_size(value: Any) -> int:
+    """결과 값을 UTF-8로 직렬화했을 때의 바이트 수.
+
+    pydantic 모델(예: ``NewsDigest``)은 repr이 아니라 실제로 전송되는 JSON 크기를 셉니다.
+    """
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(pydantic_core.to_json(value, serialize_unknown=True))
+
+
+METRICS = ToolMetrics()
+
+
+# 모델별 100만 토큰당 USD 가격 (입력, 출력). LLM_PRICES="모델=입력/출력,..."로 덮어쓰거나 추가합니다.
+DEFAULT_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+def parse_prices(spec: str | None) -> dict[str, tuple[float, float]]:
+    """``"gpt-4o=2.5/10,my-model=0.2/0.8"`` 형식을 기본 가격표에 덮어씁니다."""
+    prices = dict(DEFAULT_PRICES)
+    for part in (spec or "").split(","):
+        model, sep, value = part.partition("=")
+        model = model.strip()
+        if not sep or not model:
+            continue
+        prompt, _, completion = value.partition("/")
+        prices[model] = (float(prompt), float(completion or prompt))
+    return prices
+
+
+LLM_PRICES = parse_prices(os.getenv("LLM_PRICES"))
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """추정 비용(USD). 가격을 모르는 모델이면 None입니다."""
+    price = LLM_PRICES.get(model) or LLM_PRICES.get(model.rsplit("/", 1)[-1])
+    if price is None:
+        return None
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+class _AgentSeries:
+    __slots__ = ("models", "latency", "calls", "cache_hits", "errors", "prompt_tokens", "completion_tokens",
+                 "estimated", "cost", "unpriced")
+
+    def __init__(self) -> None:
+        self.models: set[str] = set()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.calls = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated = 0
+        self.cost = 0.0
+        self.unpriced = 0
+
+
+class LLMUsage:
+    """에이전트(역할)별 LLM 호출 수, 지연 시간, 토큰 수, 추정 비용을 기록합니다.
+
+    캐시 적중은 호출 수와 지연 시간에는 들어가지만 토큰과 비용은 0입니다.
+    공급자가 사용량을 알려 주지 않은 호출은 추정 토큰 수로 세고 ``estimated``에 남깁니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[str, _AgentSeries] = {}
+
+    def observe(
+        self,
+        agent: str,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached: bool = False,
+        estimated: bool = False,
+        error: bool = False,
+    ) -> None:
+        cost = None if cached or error else estimate_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            series = self._series.get(agent)
+            if series is None:
+                series = self._series[agent] = _AgentSeries()
+            series.models.add(model)
+            series.calls += 1
+            series.latency.observe(seconds)
+            series.errors += int(error)
+            if cached:
+                series.cache_hits += 1
+                return
+            series.prompt_tokens += prompt_tokens
+            series.completion_tokens += completion_tokens
+            series.estimated += int(estimated)
+            if cost is None:
+                series.unpriced += int(not error)
+            else:
+                series.cost += cost
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """``{agent: {...}}`` 형태의 JSON 직렬화 가능한 요약."""
+        with self._lock:
+            return {
+                agent: {
+                    "models": sorted(series.models),
+                    "calls": series.calls,
+                    "cache_hits": series.cache_hits,
+                    "errors": series.errors,
+                    "latency_ms": {
+                        "total": round(series.latency.sum * 1000, 3),
+                        "mean": round(series.latency.sum / series.calls * 1000, 3) if series.calls else None,
+                        "p95_le": _ms(series.latency.quantile(0.95)),
+                    },
+                    "prompt_tokens": series.prompt_tokens,
+                    "completion_tokens": series.completion_tokens,
+                    "estimated_calls": series.estimated,
+                    "cost_usd": round(series.cost, 6),
+                    "unpriced_calls": series.unpriced,
+                }
+                for agent, series in sorted(self._series.items())
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            items = sorted(self._series.items())
+            for metric, kind, help_text, value in (
+                ("newsletter_llm_calls_total", "counter", "LLM calls per agent.", lambda s: s.calls),
+                ("newsletter_llm_cache_hits_total", "counter", "LLM calls served from the completion cache.",
+                 lambda s: s.cache_hits),
+                ("newsletter_llm_prompt_tokens_total", "counter", "Prompt tokens per agent.",
+                 lambda s: s.prompt_tokens),
+                ("newsletter_llm_completion_tokens_total", "counter", "Completion tokens per agent.",
+                 lambda s: s.completion_tokens),
+                ("newsletter_llm_cost_usd_total", "counter", "Estimated LLM cost per agent.", lambda s: s.cost),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                for agent, series in items:
+                    lines.append(f'{metric}{{agent="{agent}"}} {value(series)}')
+            metric = "newsletter_llm_latency_seconds"
+            lines += [f"# HELP {metric} LLM call latency per agent.", f"# TYPE {metric} histogram"]
+            for agent, series in items:
+                for bound, count in series.latency.cumulative():
+                    lines.append(f'{metric}_bucket{{agent="{agent}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{agent="{agent}"}} {series.latency.sum}')
+                lines.append(f'{metric}_count{{agent="{agent}"}} {series.latency.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+LLM_USAGE = LLMUsage()
+
+
+def instrument(
+    side: str = "server",
+    name: str | None = None,
+    is_error: Callable[[Any], bool] | None = None,
+) -> Callable[[F], F]:
+    """도구 함수의 지연 시간, 결과 크기, 오류를 ``METRICS``에 기록합니다.
+
+    ``functools.wraps``로 시그니처를 보존하므로 ``@app.tool`` 아래에 붙여도
+    FastMCP가 만드는 인자 스키마는 그대로입니다. 예외 대신 오류 메시지를
+    반환하는 도구는 ``is_error``로 실패한 결과를 구분합니다.
+    """
+
+    def decorator(fn: F) -> F:
+        tool = name or fn.__name__
+
+        def _record(start: float, result: Any) -> None:
+            failed = bool(is_error and is_error(result))
+            METRICS.observe(side, tool, time.perf_counter() - start, payload_size(result), error=failed)
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    METRICS.observe(side, tool, time.perf_counter() - start, error=True)
+                    raise
+                _record(start, result)
+                return result
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                METRICS.observe(side, tool, time.perf_counter() - start, error=True)
+                raise
+            _record(start, result)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,174 @@
+"""Deterministic local pre-ranking of candidate stories.
+
+LLM이 모든 후보를 읽고 고르는 대신, 후보 전체를 아래 네 가지 신호로 한 번에
+점수화해 상위 몇 개만 뉴스 수집 에이전트에 넘깁니다.
+
+- recency: 발행 후 경과 시간에 대한 지수 감쇠 (반감기 ``RANK_HALF_LIFE_HOURS``)
+- relevance: 설정한 관심 주제(``RANK_TOPICS``)와 제목+요약의 TF-IDF 코사인 유사도
+- source: 피드별 가중치 (``NEWS_FEEDS_FILE``의 ``weight``, 기본 1.0)
+- coverage: 같은 이야기로 묶인 매체 수 (``newsletter_dedupe`` 클러스터 크기)
+
+단어 추출과 어휘 번호 매기기만 파이썬에서 하고, 빈도, TF-IDF, 점수 계산은
+0이 아닌 (문서, 단어) 쌍 배열 위에서 numpy로 한 번에 처리합니다. 같은 입력과
+``now``에는 항상 같은 순서를 돌려줍니다.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+
+from newsletter_article import Article
+
+DEFAULT_TOPICS = "AI, LLM, model, OpenAI, Anthropic, Google, Meta, agent, GPU, chip, startup, 인공지능, 반도체"
+RANK_TOPICS = os.getenv("RANK_TOPICS", DEFAULT_TOPICS)
+RANK_HALF_LIFE_HOURS = float(os.getenv("RANK_HALF_LIFE_HOURS", "24"))
+DEFAULT_WEIGHTS = {"recency": 0.35, "relevance": 0.35, "source": 0.15, "coverage": 0.15}
+# 제목 단어는 요약 단어보다 이만큼 더 자주 나온 것으로 셉니다.
+TITLE_BOOST = 2
+
+_WORD_RE = re.compile(r"\w{2,}")
+_TAG_RE = re.compile(r"<[^>]+>")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "after about new says said how why what more than into over".split()
+)
+
+
+def parse_weights(spec: str | None) -> dict[str, float]:
+    """``"recency=0.4,relevance=0.4"`` 형식을 기본 가중치에 덮어씁니다."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        name = name.strip()
+        if not sep or not name:
+            continue
+        if name not in weights:
+            raise ValueError(f"알 수 없는 순위 신호입니다: {name} (가능한 값: {', '.join(DEFAULT_WEIGHTS)})")
+        weights[name] = float(value)
+    return weights
+
+
+RANK_WEIGHTS = parse_weights(os.getenv("RANK_WEIGHTS"))
+
+
+def _words(text: str) -> list[str]:
+    # 불용어는 걸러내지 않은 두 글자 이상의 단어 (불용어는 어휘 단위로 한 번에 제거)
+    if "<" in text:
+        text = _TAG_RE.sub(" ", text)
+    return _WORD_RE.findall(text.lower())
+
+
+def tokenize(text: str) -> list[str]:
+    return [word for word in _words(text) if word not in _STOPWORDS]
+
+
+def _topic_terms(topics: str | list[str]) -> set[str]:
+    if isinstance(topics, str):
+        topics = topics.split(",")
+    return {term for topic in topics for term in tokenize(topic)}
+
+
+def _relevance(articles: list[Article], topics: set[str]) -> np.ndarray:
+    """각 기사와 주제 질의의 TF-IDF 코사인 유사도.
+
+    모든 문서의 단어를 한 배열로 이어 붙인 뒤 (문서, 단어)별 빈도를 ``np.unique``로
+    구하므로, 파이썬 반복은 단어 추출과 어휘 번호 매기기뿐입니다.
+    """
+    n = len(articles)
+    docs = [_words(article.title) * TITLE_BOOST + _words(article.summary) for article in articles]
+    lengths = np.fromiter(map(len, docs), dtype=np.int64, count=n)
+    if not topics or not lengths.sum():
+        return np.zeros(n)
+
+    vocab: dict[str, int] = {}
+    term_ids = np.array([vocab.setdefault(word, len(vocab)) for doc in docs for word in doc], dtype=np.int64)
+    size = len(vocab)
+    keys, counts = np.unique(np.repeat(np.arange(n), lengths) * size + term_ids, return_counts=True)
+    row_idx, col_idx = keys // size, keys % size
+    stop = np.zeros(size, dtype=bool)
+    stop[[vocab[word] for word in _STOPWORDS if word in vocab]] = True
+    keep = ~stop[col_idx]
+    row_idx, col_idx, counts = row_idx[keep], col_idx[keep], counts[keep]
+
+    tf = 1.0 + np.log(counts)
+    df = np.bincount(col_idx, minlength=size)
+    idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+    weights = tf * idf[col_idx]
+    norms = np.sqrt(np.bincount(row_idx, weights=weights * weights, minlength=n))
+
+    query = np.zeros(size)
+    topic_ids = [vocab[term] for term in topics if term in vocab]
+    query[topic_ids] = np.where(df[topic_ids] > 0, idf[topic_ids], 0.0)
+    query_norm = np.linalg.norm(query)
+    if query_norm == 0:
+        return np.zeros(n)
+    dots = np.bincount(row_idx, weights=weights * query[col_idx], minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(norms > 0, dots / (norms * query_norm), 0.0)
+
+
+def _scaled(values: np.ndarray) -> np.ndarray:
+    peak = values.max() if values.size else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+
+def score_articles(
+    articles: list[Article],
+    topics: str | list[str] = RANK_TOPICS,
+    source_weights: dict[str, float] | None = None,
+    weights: dict[str, float] | None = None,
+    now: datetime | None = None,
+) -> np.ndarray:
+    """기사마다 0~1 범위 신호의 가중합 점수를 계산합니다."""
+    if not articles:
+        return np.zeros(0)
+    weights = weights or RANK_WEIGHTS
+    source_weights = source_weights or {}
+    now_ts = (now or datetime.now(timezone.utc)).timestamp()
+
+    published = np.array(
+        [article.published.timestamp() if article.published else np.nan for article in articles]
+    )
+    age_hours = np.clip((now_ts - published) / 3600.0, 0.0, None)
+    recency = np.nan_to_num(np.exp2(-age_hours / RANK_HALF_LIFE_HOURS), nan=0.0)
+
+    source = np.array(
+        [max(source_weights.get(str(s["source"]), 1.0) for s in article.sources) for article in articles]
+    )
+    coverage = np.log1p(np.array([len(article.sources) for article in articles], dtype=np.float64))
+
+    return (
+        weights["recency"] * recency
+        + weights["relevance"] * _scaled(_relevance(articles, _topic_terms(topics)))
+        + weights["source"] * _scaled(source)
+        + weights["coverage"] * _scaled(coverage)
+    )
+
+
+def rank_articles(
+    articles: list[Article],
+    topics: str | list[str] = RANK_TOPICS,
+    source_weights: dict[str, float] | None = None,
+    weights: dict[str, float] | None = None,
+    now: datetime | None = None,
+) -> list[Article]:
+    """점수 내림차순으로 정렬한 새 목록을 돌려주고 각 기사의 ``score``를 채웁니다.
+
+    점수가 같으면 최근 기사, 그다음 내용 해시 순으로 정렬해 결과가 항상 같습니다.
+    """
+    scores = score_articles(articles, topics, source_weights, weights, now)
+    for article, score in zip(articles, scores):
+        article.score = round(float(score), 6)
+    return sorted(
+        articles,
+        key=lambda article: (
+            -article.score,
+            -(article.published.timestamp() if article.published else -math.inf),
+            article.hash,
+        ),
+    )
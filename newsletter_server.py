@@ -1,27 +1,55 @@
 """Newsletter MCP server with email composition/sending and news fetching tools."""
 
+import asyncio
+import inspect
 import os
 import smtplib
+import sqlite3
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Any, Callable, List, Dict, Optional
 
-import requests
 from dotenv import load_dotenv
 from fastmcp import FastMCP
-from openai import OpenAI
+from pydantic import BaseModel, Field, TypeAdapter
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from newsletter_dedupe import cluster_items
+from newsletter_article import Article
+from newsletter_extract import extract_articles
+from newsletter_feeds import fetch_feeds, format_items, load_feeds
+from newsletter_metrics import METRICS, instrument
+from newsletter_rank import rank_articles
+from newsletter_store import get_store
+from newsletter_text import summarize_html, truncate_words
 
 load_dotenv()
 
+# only_unseen일 때 이미 다룬 기사를 걸러낼 여유분으로 count의 몇 배를 읽을지
+UNSEEN_OVERSCAN = int(os.getenv("NEWS_UNSEEN_OVERSCAN", "4"))
+# batch_call이 동시에 실행하는 도구 호출 수의 상한
+BATCH_MAX_CONCURRENCY = int(os.getenv("MCP_BATCH_MAX_CONCURRENCY", "8"))
+# rank=True일 때 피드마다 읽어 순위를 매길 후보 수
+RANK_POOL = int(os.getenv("NEWS_RANK_POOL", "20"))
+# full_text=True일 때 기사마다 돌려줄 본문 최대 글자 수
+FULL_TEXT_CHARS = int(os.getenv("NEWS_FULL_TEXT_CHARS", "1500"))
+
 app = FastMCP(
     name="newsletter-mcp-server",
     instructions="Newsletter creation tools with email composition, sending, and news fetching.",
 )
 
 
+def _is_error_message(result: Any) -> bool:
+    # 도구들은 실패를 예외 대신 "❌"로 시작하는 메시지로 돌려줍니다.
+    return isinstance(result, str) and result.startswith("❌")
+
+
 
 @app.tool
+@instrument(is_error=_is_error_message)
 def send_email(to: str, subject: str, body: str) -> str:
     """Gmail SMTP를 통해 이메일을 발송합니다.
 
@@ -59,53 +87,143 @@ def send_email(to: str, subject: str, body: str) -> str:
         return f"❌ 이메일 발송 실패: {str(e)}"
 
 
+class NewsSource(BaseModel):
+    source: str = Field(description="피드 이름")
+    link: str = Field(description="해당 매체의 기사 URL")
+
+
+class NewsArticle(BaseModel):
+    title: str = Field(description="제목")
+    link: str = Field(description="원문 URL")
+    summary: str = Field(description="HTML을 제거하고 줄인 요약")
+    published: Optional[str] = Field(default=None, description="발행 시각 (ISO 8601)")
+    source: str = Field(description="피드 이름")
+    hash: str = Field(description="제목+요약의 내용 해시")
+    sources: List[NewsSource] = Field(default_factory=list, description="같은 이야기를 보도한 매체 목록")
+    text: Optional[str] = Field(default=None, description="full_text=True일 때 원문에서 추출한 본문 앞부분")
+    stale: bool = Field(default=False, description="피드 요청 실패로 마지막으로 받은 이전 항목을 대신 쓴 경우 True")
+    score: Optional[float] = Field(default=None, description="사전 순위 점수 (rank=True일 때, 높을수록 우선)")
+
+    @classmethod
+    def from_article(cls, article: Article) -> "NewsArticle":
+        return cls(
+            title=article.title,
+            link=article.link,
+            summary=summarize_html(article.summary),
+            published=article.published.isoformat() if article.published else None,
+            source=article.source,
+            hash=article.hash,
+            sources=[NewsSource(source=str(s["source"]), link=s["link"]) for s in article.sources],
+            text=truncate_words(article.body, FULL_TEXT_CHARS) if article.body else None,
+            stale=article.stale,
+            score=article.score,
+        )
+
+
+class NewsDigest(BaseModel):
+    articles: List[NewsArticle] = Field(default_factory=list, description="선택된 기사 목록")
+    errors: Dict[str, str] = Field(default_factory=dict, description="실패한 피드 이름 또는 기사 링크별 오류 메시지")
+    notice: Optional[str] = Field(default=None, description="기사가 없거나 대체 데이터를 쓴 이유")
+    stale: bool = Field(default=False, description="요청에 실패한 피드의 이전 항목이 섞여 있는지 여부")
+    text: Optional[str] = Field(default=None, description="include_text=True일 때의 텍스트 표현")
+
+
+def _digest(articles: List[Article], include_text: bool, **fields: Any) -> NewsDigest:
+    stale = any(article.stale for article in articles)
+    return NewsDigest(
+        articles=[NewsArticle.from_article(article) for article in articles],
+        text=format_items(articles) if include_text and articles else None,
+        stale=stale,
+        notice="일부 피드를 가져오지 못해 마지막으로 받은 기사를 포함했습니다." if stale else None,
+        **fields,
+    )
+
+
+def _is_failed_digest(result: Any) -> bool:
+    return isinstance(result, NewsDigest) and not result.articles and bool(result.errors)
+
+
 @app.tool
-def fetch_tech_news(count: int = 5) -> str:
-    """AI/Tech 관련 최신 뉴스를 RSS 피드에서 가져옵니다.
+@instrument(is_error=_is_failed_digest)
+def fetch_tech_news(
+    count: int = 5,
+    only_unseen: bool = False,
+    include_text: bool = False,
+    full_text: bool = False,
+    rank: bool = True,
+) -> NewsDigest:
+    """AI/Tech 관련 최신 뉴스를 등록된 RSS/Atom/JSON Feed 피드들에서 동시에 가져옵니다.
+
+    여러 피드에 실린 거의 같은 기사는 출처 목록을 가진 하나의 기사로 묶습니다.
+    같은 기사(정규화 URL 또는 내용 해시 기준)는 한 번만 포함됩니다. 반환한
+    기사는 바로 기록하지 않으며, 발송에 성공한 뒤 mark_seen으로 기록해야 다음
+    실행에서 다룬 기사가 됩니다. 결과는 기사 필드 목록(structured content)이며,
+    텍스트 표현이 필요하면 include_text=True를 넘깁니다. full_text=True면
+    선택된 기사의 원문 페이지에서 본문을 추출해 text 필드에 담습니다.
+
+    rank=True(기본값)면 피드마다 NEWS_RANK_POOL개의 후보를 읽어 최신성, 주제
+    관련도, 피드 가중치, 보도 매체 수로 점수를 매기고 점수 순으로 count개를
+    고릅니다. False면 발행 시각 순으로 고릅니다.
 
     Args:
         count: 가져올 뉴스 개수 (기본값: 5)
+        only_unseen: True면 이전 실행에서 이미 반환한 기사를 제외
+        include_text: True면 사람이 읽는 텍스트 표현(text)도 함께 반환
+        full_text: True면 기사마다 원문 본문 앞부분(articles[].text)도 함께 반환
+        rank: True면 사전 순위 점수 순으로 선택
     """
+    feeds = load_feeds()
+    per_feed = count * UNSEEN_OVERSCAN if only_unseen else count
+    if rank:
+        per_feed = max(per_feed, RANK_POOL)
+    items, errors = fetch_feeds(feeds, limit=per_feed)
+    if not items:
+        reasons = "; ".join(f"{name}: {error}" for name, error in errors.items()) or "등록된 피드에 기사가 없습니다"
+        return NewsDigest(errors=errors, notice=f"❌ 뉴스를 가져오지 못했습니다: {reasons}")
+
+    items = cluster_items(items)
+    if rank:
+        items = rank_articles(items, source_weights={feed.name: feed.weight for feed in feeds})
     try:
-        # TechCrunch AI RSS 피드 사용
-        response = requests.get("https://techcrunch.com/category/artificial-intelligence/feed/", timeout=10)
-        response.raise_for_status()
-
-        root = ET.fromstring(response.content)
-        items = root.findall('.//item')[:count]
-
-        news_list = []
-        for item in items:
-            title = item.find('title').text if item.find('title') is not None else "제목 없음"
-            link = item.find('link').text if item.find('link') is not None else ""
-            description = item.find('description').text if item.find('description') is not None else ""
-
-            # HTML 태그 제거
-            import re
-            clean_desc = re.sub(r'<[^>]+>', '', description)[:200] + "..."
+        store = get_store()
+        classified = store.classify(items)
+        selected = [item for item, is_new in classified if is_new or not only_unseen][:count]
+        store.remember_selected(selected)
+    except sqlite3.Error:
+        # 저장소를 쓸 수 없어도 수집 결과는 돌려줍니다.
+        selected = items[:count]
+    if not selected:
+        return NewsDigest(
+            errors=errors,
+            notice="새로운 뉴스가 없습니다. 수집된 기사는 모두 이전 실행에서 다룬 기사입니다.",
+        )
+    if full_text:
+        errors.update(extract_articles(selected))
+    return _digest(selected, include_text, errors=errors)
 
-            news_list.append(f"📰 {title}\n🔗 {link}\n📝 {clean_desc}\n")
 
-        return "\n".join(news_list)
-
-    except Exception as e:
-        # RSS 실패 시 샘플 뉴스 반환
-        return f"""📰 OpenAI GPT-4 Turbo 새 업데이트 발표
-🔗 https://example.com/gpt4-update
-📝 OpenAI가 GPT-4 Turbo의 새로운 기능을 발표했습니다...
-
-📰 Google Bard AI 한국어 지원 확대
-🔗 https://example.com/bard-korean
-📝 구글이 Bard AI의 한국어 지원을 대폭 확대한다고 발표...
+@app.tool
+@instrument(is_error=_is_error_message)
+def mark_seen(links: List[str]) -> str:
+    """발송한 뉴스레터에 실린 기사를 다룬 기사로 기록합니다.
 
-📰 AI 스타트업 투자 급증, 2024년 전망
-🔗 https://example.com/ai-investment
-📝 올해 AI 스타트업에 대한 투자가 전년 대비 150% 증가...
+    fetch_tech_news가 반환하며 기사 저장소의 선택 기록에 남긴 기사만 기록하고,
+    모르는 링크는 건너뜁니다. 발송에 성공한 뒤에만 호출하세요.
 
-(실제 RSS 피드 연결 실패로 샘플 데이터 표시: {str(e)})"""
+    Args:
+        links: 뉴스레터에 실린 기사 링크 목록
+    """
+    try:
+        count = get_store().mark_selected_seen(links)
+    except sqlite3.Error as e:
+        return f"❌ 기사 기록 실패: {e}"
+    if not count:
+        return "기록할 기사가 없습니다 (fetch_tech_news가 반환한 기사의 링크가 아닙니다)."
+    return f"✅ {count}개 기사를 다룬 기사로 기록했습니다."
 
 
 @app.tool
+@instrument()
 def create_newsletter_html(title: str, news_content: str, intro_text: str = "") -> str:
     """뉴스 내용을 기반으로 HTML 뉴스레터를 생성합니다.
 
@@ -153,6 +271,65 @@ def create_newsletter_html(title: str, news_content: str, intro_text: str = "")
     return html_template
 
 
+class BatchCall(BaseModel):
+    tool: str = Field(description="호출할 도구 이름")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="도구 인자")
+
+
+class BatchItemResult(BaseModel):
+    index: int = Field(description="요청 목록에서의 위치")
+    tool: str = Field(description="호출한 도구 이름")
+    ok: bool = Field(description="성공 여부")
+    result: Any = Field(default=None, description="도구 반환값")
+    error: Optional[str] = Field(default=None, description="실패 시 오류 메시지")
+
+
+@lru_cache(maxsize=None)
+def _tool_adapter(fn: Callable[..., Any]) -> TypeAdapter:
+    return TypeAdapter(fn)
+
+
+@app.tool
+@instrument()
+async def batch_call(calls: List[BatchCall], max_concurrency: int = 4) -> List[BatchItemResult]:
+    """여러 도구 호출을 한 번의 요청으로 실행하고 항목별 결과를 반환합니다.
+
+    동기 도구는 스레드에서 실행되며, 한 항목의 실패는 다른 항목에 영향을 주지 않습니다.
+
+    Args:
+        calls: 호출 목록 (각 항목은 tool, arguments)
+        max_concurrency: 동시에 실행할 최대 호출 수 (서버 상한 MCP_BATCH_MAX_CONCURRENCY)
+    """
+    semaphore = asyncio.Semaphore(max(1, min(max_concurrency, BATCH_MAX_CONCURRENCY)))
+
+    async def _run(index: int, call: BatchCall) -> BatchItemResult:
+        async with semaphore:
+            try:
+                if call.tool == "batch_call":
+                    raise ValueError("batch_call은 중첩해서 호출할 수 없습니다.")
+                tool = await app.get_tool(call.tool)
+                adapter = _tool_adapter(tool.fn)
+                if inspect.iscoroutinefunction(tool.fn):
+                    result = await adapter.validate_python(call.arguments)
+                else:
+                    result = await asyncio.to_thread(adapter.validate_python, call.arguments)
+                return BatchItemResult(index=index, tool=call.tool, ok=True, result=result)
+            except Exception as e:
+                return BatchItemResult(index=index, tool=call.tool, ok=False, error=str(e))
+
+    return list(await asyncio.gather(*(_run(i, call) for i, call in enumerate(calls))))
+
+
+@app.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """도구별 지표를 Prometheus 텍스트 형식으로 노출합니다."""
+    return PlainTextResponse(METRICS.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.custom_route("/metrics.json", methods=["GET"])
+async def metrics_json_endpoint(request: Request) -> JSONResponse:
+    """도구별 지표 요약을 JSON으로 노출합니다."""
+    return JSONResponse(METRICS.summary())
 
 
 if __name__ == "__main__":
@@ -161,9 +338,14 @@ if __name__ == "__main__":
     print("  - send_email: Gmail SMTP로 발송")
     print("  - fetch_tech_news: AI/Tech 뉴스 수집")
     print("  - create_newsletter_html: HTML 뉴스레터 생성")
+    print("  - mark_seen: 발송한 기사를 다룬 기사로 기록")
+    print("  - batch_call: 여러 도구 호출을 한 번에 실행")
     print()
-    print("🌐 HTTP Transport 사용 - http://localhost:8000/mcp/")
+    host = os.getenv("MCP_HOST", "127.0.0.1")
+    port = int(os.getenv("MCP_PORT", "8000"))
+    print(f"🌐 HTTP Transport 사용 - http://{host}:{port}/mcp/")
+    print(f"📈 지표: http://{host}:{port}/metrics (JSON: /metrics.json)")
     print("⚠️  환경변수 확인: OPENAI_API_KEY, GMAIL_USER, GMAIL_APP_PASSWORD")
     print()
 
-    app.run(transport="http", host="127.0.0.1", port=8000)
\ No newline at end of file
+    app.run(transport="http", host=host, port=port)
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""SQLite article store used to skip stories already covered in earlier runs.
+
+URL은 추적 파라미터, 프래그먼트, ``www.``, 기본 포트, 끝 슬래시 등을 정리한
+정규화 URL로 저장하고, 제목+요약의 내용 해시를 함께 보관해 주소가 다른 같은
+기사도 알아봅니다. MinHash 서명과 LSH 밴드 키(``newsletter_dedupe``)도 함께
+저장해 제목이 다른 거의 같은 기사도 이전에 다룬 것으로 판단합니다.
+수집 도구가 반환했지만 아직 발송하지 않은 기사는 ``selected`` 테이블에 따로
+두었다가 발송에 성공하면 다룬 기사로 옮깁니다.
+기본 위치는 ``NEWSLETTER_CACHE_DIR/articles.sqlite3``이며 ``ARTICLE_DB``로 바꿀 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from newsletter_article import Article
+from newsletter_dedupe import NEAR_DUP_THRESHOLD, band_keys, pack_signature, similarity, unpack_signature
+from newsletter_feeds import CACHE_DIR
+
+# 기사 식별과 무관한 쿼리 파라미터 (접두사 또는 전체 이름)
+TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "pk_", "hsa_")
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "ref", "ref_src", "cmpid", "guccounter"})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    canonical_url TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    source TEXT,
+    published TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles(content_hash);
+CREATE TABLE IF NOT EXISTS article_bands (
+    band_key TEXT NOT NULL,
+    canonical_url TEXT NOT NULL,
+    PRIMARY KEY (band_key, canonical_url)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS selected (
+    link_url TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    source TEXT,
+    published TEXT,
+    signature BLOB,
+    selected_at TEXT NOT NULL
+);
+"""
+# 발송되지 않은 선택 기록을 보관하는 기간(일)
+SELECTED_MAX_AGE_DAYS = float(os.getenv("NEWS_SELECTED_MAX_AGE_DAYS", "7"))
+
+
+def canonicalize_url(url: str) -> str:
+    """같은 기사를 가리키는 URL들이 같은 문자열이 되도록 정리합니다."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAM_PREFIXES) and key.lower() not in TRACKING_PARAMS
+    )
+    # http/https 차이는 같은 기사로 봅니다.
+    return urlunsplit(("https", netloc, path, urlencode(query), ""))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ArticleStore:
+    """수집한 기사를 정규화 URL과 내용 해시로 기록합니다."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        if "signature" not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN signature BLOB")
+
+    def _known(self, keys: list[tuple[str, str]]) -> tuple[set[str], set[str]]:
+        urls = [url for url, _ in keys]
+        hashes = [digest for _, digest in keys]
+        known_urls: set[str] = set()
+        known_hashes: set[str] = set()
+        # SQLite 변수 개수 제한을 피하려고 나눠서 조회합니다.
+        for start in range(0, len(keys), 400):
+            url_chunk, hash_chunk = urls[start:start + 400], hashes[start:start + 400]
+            rows = self._conn.execute(
+                f"SELECT canonical_url, content_hash FROM articles "
+                f"WHERE canonical_url IN ({','.join('?' * len(url_chunk))}) "
+                f"OR content_hash IN ({','.join('?' * len(hash_chunk))})",
+                (*url_chunk, *hash_chunk),
+            ).fetchall()
+            for url, digest in rows:
+                known_urls.add(url)
+                known_hashes.add(digest)
+        return known_urls, known_hashes
+
+    def _has_near_duplicate(self, signature: tuple[int, ...], threshold: float) -> bool:
+        keys = band_keys(signature)
+        rows = self._conn.execute(
+            f"SELECT a.signature FROM articles a WHERE a.canonical_url IN ("
+            f"SELECT canonical_url FROM article_bands WHERE band_key IN ({','.join('?' * len(keys))}))",
+            keys,
+        ).fetchall()
+        return any(data and similarity(signature, unpack_signature(data)) >= threshold for (data,) in rows)
+
+    @staticmethod
+    def _keys(item: Article) -> tuple[str, str]:
+        digest = item.hash
+        url = canonicalize_url(item.link) if item.link else f"hash:{digest}"
+        return url, digest
+
+    def classify(self, items: Iterable[Article]) -> list[tuple[Article, bool]]:
+        """(항목, 처음 보는 기사인지) 목록을 반환합니다. 저장소는 바꾸지 않습니다.
+
+        같은 호출 안에서 URL이나 내용 해시가 겹치는 항목은 첫 번째만 남깁니다.
+        항목에 ``signature``가 있으면 저장된 기사와의 유사도도 확인합니다.
+        """
+        unique: list[tuple[Article, str, str]] = []
+        batch_urls: set[str] = set()
+        batch_hashes: set[str] = set()
+        for item in items:
+            url, digest = self._keys(item)
+            if url in batch_urls or digest in batch_hashes:
+                continue
+            batch_urls.add(url)
+            batch_hashes.add(digest)
+            unique.append((item, url, digest))
+
+        results = []
+        with self._lock:
+            known_urls, known_hashes = self._known([(url, digest) for _, url, digest in unique])
+            for item, url, digest in unique:
+                is_new = url not in known_urls and digest not in known_hashes
+                if is_new and item.signature:
+                    is_new = not self._has_near_duplicate(item.signature, NEAR_DUP_THRESHOLD)
+                results.append((item, is_new))
+        return results
+
+    def mark_seen(self, items: Iterable[Article]) -> None:
+        """항목들을 다룬 기사로 기록합니다. 이미 있으면 last_seen만 갱신합니다."""
+        now = _now()
+        rows = []
+        bands = []
+        for item in items:
+            url, digest = self._keys(item)
+            signature = item.signature
+            rows.append((
+                url,
+                item.link,
+                item.title,
+                digest,
+                item.source,
+                item.published.isoformat() if item.published else None,
+                now,
+                now,
+                pack_signature(signature) if signature else None,
+            ))
+            if signature:
+                bands.extend((key, url) for key in band_keys(signature))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO articles "
+                "(canonical_url, url, title, content_hash, source, published, first_seen, last_seen, signature) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(canonical_url) DO UPDATE SET last_seen = excluded.last_seen, "
+                "seen_count = seen_count + 1, signature = COALESCE(excluded.signature, signature)",
+                rows,
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO article_bands (band_key, canonical_url) VALUES (?, ?)", bands)
+
+    def remember_selected(self, items: Iterable[Article]) -> None:
+        """반환한 기사를 발송 전 선택 기록에 남깁니다. ``mark_selected_seen``이 이 기록을 씁니다.
+
+        보도 매체 링크 중 어느 것으로도 찾을 수 있게 링크마다 한 행을 쓰며,
+        ``SELECTED_MAX_AGE_DAYS``보다 오래된 기록은 지웁니다.
+        """
+        now = _now()
+        rows = []
+        for item in items:
+            url, digest = self._keys(item)
+            signature = pack_signature(item.signature) if item.signature else None
+            published = item.published.isoformat() if item.published else None
+            for link in {item.link, *(source["link"] for source in item.sources)}:
+                if link:
+                    rows.append((canonicalize_url(link), url, item.link, item.title, digest, item.source, published, signature, now))
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=SELECTED_MAX_AGE_DAYS)).isoformat()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM selected WHERE selected_at < ?", (cutoff,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO selected "
+                "(link_url, canonical_url, url, title, content_hash, source, published, signature, selected_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def mark_selected_seen(self, links: Iterable[str]) -> int:
+        """선택 기록에 있는 링크의 기사를 다룬 기사로 기록하고 기록한 기사 수를 반환합니다.
+
+        선택 기록은 디스크에 있으므로 서버를 다시 시작했거나 뉴스 수집 결과를
+        기록에서 꺼내 쓴(rw 이어서 실행) 경우에도 찾을 수 있습니다. 모르는 링크는 건너뜁니다.
+        """
+        keys = list(dict.fromkeys(canonicalize_url(link) for link in links))
+        articles: dict[str, Article] = {}
+        with self._lock:
+            for start in range(0, len(keys), 400):
+                chunk = keys[start:start + 400]
+                rows = self._conn.execute(
+                    "SELECT canonical_url, url, title, content_hash, source, published, signature FROM selected "
+                    f"WHERE link_url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for canonical, url, title, digest, source, published, signature in rows:
+                    article = Article(
+                        title,
+                        url,
+                        published=datetime.fromisoformat(published) if published else None,
+                        source=source or "",
+                        hash=digest,
+                    )
+                    article.signature = unpack_signature(signature) if signature else None
+                    articles[canonical] = article
+        if not articles:
+            return 0
+        self.mark_seen(articles.values())
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM selected WHERE canonical_url = ?", [(url,) for url in articles])
+        return len(articles)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_STORE: ArticleStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> ArticleStore:
+    """프로세스에서 공유하는 기사 저장소를 엽니다."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ArticleStore(os.getenv("ARTICLE_DB") or CACHE_DIR / "articles.sqlite3")
+        return _STORE
@@ -0,0 +1,175 @@
+"""Map-reduce summarization of the selected stories.
+
+편집 에이전트가 선별된 기사 전체를 한 번의 긴 LLM 턴에서 차례로 요약·번역하는
+대신, 기사마다 짧은 LLM 호출을 동시에 보내고(map) 결과의 제목과 첫 문장만으로
+서론을 쓰는 짧은 호출 하나(reduce)로 뉴스레터 본문을 조립합니다. 전체 소요
+시간은 기사 수의 합이 아니라 가장 느린 기사 하나에 가까워집니다.
+
+- 동시에 보내는 호출 수는 ``SUMMARY_MAX_CONCURRENCY``로 제한합니다.
+- 호출마다 시작 시점부터 ``SUMMARY_TIMEOUT``초가 지나면 기다리지 않고 원문
+  제목과 요약으로 대신합니다. 실패한 기사가 있어도 뉴스레터는 만들어집니다.
+
+LLM은 ``call(messages) -> str``만 있으면 되므로 crewai를 직접 불러오지 않습니다.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from newsletter_text import summarize_html, truncate_words
+
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+SUMMARY_TIMEOUT = float(os.getenv("SUMMARY_TIMEOUT", "60"))
+# 기사 하나의 프롬프트에 넣을 원문(요약 + 본문) 최대 글자 수
+SUMMARY_INPUT_CHARS = int(os.getenv("SUMMARY_INPUT_CHARS", "3000"))
+
+ARTICLE_PROMPT = (
+    "당신은 한국어 테크 뉴스레터 편집자입니다. 아래 기사를 한국 독자를 위해 정리하세요.\n"
+    "첫 줄에는 한국어 제목만 쓰고, 다음 줄부터 핵심 내용 2~3문장과 독자에게 주는 의미(인사이트) "
+    "한 문장을 한국어로 쓰세요. 기사에 없는 내용은 지어내지 마세요."
+)
+INTRO_PROMPT = (
+    "당신은 한국어 테크 뉴스레터 편집자입니다. 오늘 소개할 기사 목록을 보고 "
+    "뉴스레터 첫머리에 들어갈 2~3문장의 매력적인 서론을 한국어로 쓰세요. 서론만 출력하세요."
+)
+
+
+class SelectedArticle(BaseModel):
+    title: str = Field(description="기사 제목")
+    link: str = Field(description="기사 링크")
+    summary: str = Field(default="", description="기사 요약")
+    text: str = Field(default="", description="원문 본문 앞부분 (있으면)")
+    source: str = Field(default="", description="출처 피드")
+
+
+class SelectedNews(BaseModel):
+    """뉴스 수집 태스크의 구조화된 출력."""
+
+    articles: list[SelectedArticle] = Field(description="선별된 기사 목록 (중요한 순)")
+
+
+@dataclass
+class StorySummary:
+    """기사 하나의 map 결과. 실패하면 ``error``에 이유가 담기고 원문 요약을 씁니다."""
+
+    title: str
+    link: str
+    summary: str
+    source: str = ""
+    error: str | None = None
+    seconds: float = 0.0
+
+
+def _article_messages(article: SelectedArticle) -> list[dict[str, str]]:
+    source = summarize_html(article.summary, SUMMARY_INPUT_CHARS)
+    if article.text:
+        source = truncate_words(f"{source}\n\n{article.text}", SUMMARY_INPUT_CHARS)
+    return [
+        {"role": "system", "content": ARTICLE_PROMPT},
+        {"role": "user", "content": f"제목: {article.title}\n출처: {article.source}\n\n{source}"},
+    ]
+
+
+def _parse_story(article: SelectedArticle, response: Any) -> StorySummary:
+    lines = [line.strip() for line in str(response).strip().splitlines() if line.strip()]
+    if not lines:
+        raise ValueError("빈 응답")
+    title = lines[0].lstrip("#").strip().strip("*").strip()
+    summary = " ".join(lines[1:]) or title
+    return StorySummary(title=title, link=article.link, summary=summary, source=article.source)
+
+
+def _fallback(article: SelectedArticle, error: str, seconds: float = 0.0) -> StorySummary:
+    return StorySummary(
+        title=article.title,
+        link=article.link,
+        summary=summarize_html(article.summary, 300),
+        source=article.source,
+        error=error,
+        seconds=seconds,
+    )
+
+
+def summarize_articles(
+    llm: Any,
+    articles: list[SelectedArticle],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    timeout: float = SUMMARY_TIMEOUT,
+) -> list[StorySummary]:
+    """기사마다 LLM을 동시에 호출해 입력과 같은 순서의 요약 목록을 반환합니다 (map).
+
+    제한 시간은 호출이 실제로 시작된 때부터 잽니다. 시간을 넘긴 호출은 스레드를
+    멈출 수 없으므로 결과만 버리고, 대기 중이던 호출은 취소합니다.
+    """
+    if not articles:
+        return []
+    results: list[StorySummary | None] = [None] * len(articles)
+    started: dict[int, float] = {}
+    lock = threading.Lock()
+
+    def work(index: int) -> StorySummary:
+        with lock:
+            started[index] = time.monotonic()
+        article = articles[index]
+        story = _parse_story(article, llm.call(_article_messages(article)))
+        story.seconds = time.monotonic() - started[index]
+        return story
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_concurrency, len(articles))), thread_name_prefix="summarize"
+    )
+    pending: dict[Future[StorySummary], int] = {executor.submit(work, i): i for i in range(len(articles))}
+    try:
+        while pending:
+            now = time.monotonic()
+            with lock:
+                deadlines = [started[i] + timeout for i in pending.values() if i in started]
+            wait_for = max(0.0, min(deadlines) - now) if deadlines else timeout
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = _fallback(articles[index], f"{type(e).__name__}: {e}")
+            now = time.monotonic()
+            for future, index in list(pending.items()):
+                with lock:
+                    start = started.get(index)
+                if start is not None and now - start >= timeout:
+                    del pending[future]
+                    results[index] = _fallback(articles[index], f"시간 초과 ({timeout:.0f}초)", now - start)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [story for story in results if story is not None]
+
+
+def compose_intro(llm: Any, stories: list[StorySummary]) -> str:
+    """요약된 기사들의 제목과 첫 문장만 보고 서론을 씁니다 (reduce).
+
+    실패하면 기사 수만 알리는 기본 서론을 돌려줍니다.
+    """
+    if not stories:
+        return ""
+    outline = "\n".join(
+        f"- {story.title}: {truncate_words(story.summary.split('. ')[0], 120)}" for story in stories
+    )
+    try:
+        intro = str(llm.call([{"role": "system", "content": INTRO_PROMPT}, {"role": "user", "content": outline}]))
+    except Exception:
+        intro = ""
+    return intro.strip() or f"오늘 꼭 알아야 할 AI·기술 뉴스 {len(stories)}건을 정리했습니다."
+
+
+def render_stories(stories: list[StorySummary]) -> str:
+    """``create_newsletter_html``의 ``news_content``로 넘길 본문 텍스트."""
+    return "\n\n".join(
+        f"{i}. {story.title}\n{story.summary}\n🔗 {story.link}" for i, story in enumerate(stories, 1)
+    )
@@ -0,0 +1,146 @@
+"""CrewAI tool wrappers around the newsletter MCP tools.
+
+crewai와 pydantic을 불러오므로 ``newsletter_crew``는 태스크를 만들 때에만
+이 모듈을 import합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from newsletter_artifacts import ARTIFACTS, find_ref, mentions_ref
+from newsletter_client import account_payload, call_mcp
+
+
+_LINK_RE = re.compile(r"https?://[^\s<>\"')]+")
+
+
+class FetchNewsInput(BaseModel):
+    count: str = Field(default="5", description="수집할 뉴스 개수")
+
+def _only_unseen() -> bool:
+    # 정기 실행에서 이전에 다룬 기사를 건너뛰려면 NEWS_ONLY_UNSEEN=1
+    return os.getenv("NEWS_ONLY_UNSEEN") == "1"
+
+
+def _full_text() -> bool:
+    # 요약 대신 원문 본문 앞부분을 보고 선별하려면 NEWS_FULL_TEXT=1
+    return os.getenv("NEWS_FULL_TEXT") == "1"
+
+
+def _llm_fields() -> list[str]:
+    # LLM에 넘길 기사 필드. 필드를 줄이면 프롬프트 토큰이 그만큼 줄어듭니다.
+    # text는 NEWS_FULL_TEXT=1일 때만 채워집니다.
+    return [f.strip() for f in os.getenv("NEWS_LLM_FIELDS", "title,link,summary,text,sources,stale").split(",") if f.strip()]
+
+
+def render_digest(digest: Any, fields: list[str] | None = None) -> str:
+    """``fetch_tech_news``의 구조화된 결과를 LLM에 넘길 간결한 JSON으로 만듭니다.
+
+    기사마다 ``fields``에 있는 필드만 남기고, 출처가 하나뿐인 ``sources``는
+    ``link``와 중복이므로 뺍니다.
+    """
+    if not isinstance(digest, dict):
+        # 텍스트만 반환하는 이전 서버
+        return str(digest)
+    fields = fields or _llm_fields()
+    articles = []
+    for article in digest.get("articles") or []:
+        trimmed = {field: article[field] for field in fields if article.get(field)}
+        if len(trimmed.get("sources") or []) <= 1:
+            trimmed.pop("sources", None)
+        articles.append(trimmed)
+    if not articles and digest.get("notice"):
+        # 기사가 없으면 이유만 그대로 전달합니다 (실패 시 "❌"로 시작).
+        return digest["notice"]
+    payload: dict[str, Any] = {"articles": articles}
+    if digest.get("notice"):
+        payload["notice"] = digest["notice"]
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+class FetchNewsTool(BaseTool):
+    name: str = "fetch_news_tool"
+    description: str = "AI/Tech 뉴스를 수집합니다"
+    args_schema: type[BaseModel] = FetchNewsInput
+
+    def _run(self, count: str = "5") -> str:
+        try:
+            digest = call_mcp(
+                "fetch_tech_news",
+                encoding="structured",
+                count=int(count),
+                only_unseen=_only_unseen(),
+                full_text=_full_text(),
+            )
+            return account_payload("fetch_tech_news", render_digest(digest))
+        except Exception as e:
+            return f"뉴스 수집 중 오류: {str(e)}"
+
+
+class CreateNewsletterInput(BaseModel):
+    title: str = Field(description="뉴스레터 제목")
+    content: str = Field(description="뉴스 내용")
+    intro: str = Field(default="", description="서론 텍스트")
+
+class CreateNewsletterTool(BaseTool):
+    name: str = "create_newsletter_tool"
+    description: str = (
+        "HTML 뉴스레터를 생성해 저장하고, HTML 대신 핸들(artifact, 크기, sha256)을 반환합니다. "
+        "발송할 때는 핸들의 artifact 값을 send_email_tool의 body에 그대로 넣으세요"
+    )
+    args_schema: type[BaseModel] = CreateNewsletterInput
+
+    # 결과 HTML은 LLM에 넘기지 않으므로 MCP_RESULT_MAX_CHARS로 잘리지 않게 원본을 받습니다.
+
+    def _run(self, title: str, content: str, intro: str = "") -> str:
+        html = call_mcp(
+            "create_newsletter_html", encoding="structured", title=title, news_content=content, intro_text=intro
+        )
+        # 핸들이 잘리면 발송 단계에서 찾을 수 없으므로 자르지 않고 기록만 합니다.
+        return account_payload("create_newsletter_html", ARTIFACTS.put(html, "text/html").handle(), truncate=False)
+
+
+
+
+class SendEmailInput(BaseModel):
+    recipient: str = Field(description="받는 사람 이메일")
+    subject: str = Field(description="이메일 제목")
+    body: str = Field(description="이메일 본문, 또는 create_newsletter_tool이 반환한 artifact 값 (artifact:...)")
+
+class SendEmailTool(BaseTool):
+    name: str = "send_email_tool"
+    description: str = "이메일을 발송합니다. body에 artifact 값을 넣으면 저장된 HTML 뉴스레터를 본문으로 씁니다"
+    args_schema: type[BaseModel] = SendEmailInput
+
+    def _run(self, recipient: str, subject: str, body: str) -> str:
+        if find_ref(body) is None and mentions_ref(body):
+            # 참조를 본문에 섞어 넣으면 HTML 대신 그 문장이 그대로 발송되므로 다시 호출하게 합니다.
+            return "❌ body에는 artifact 값만 넣으세요 (예: artifact:0123456789abcdef, 다른 문장 없이)"
+        try:
+            body = ARTIFACTS.resolve(body)
+        except (KeyError, ValueError) as e:
+            return f"❌ {e.args[0]}"
+        return send_newsletter_email(recipient, subject, body)
+
+
+def send_newsletter_email(recipient: str, subject: str, body: str) -> str:
+    """이메일을 발송하고, 성공하면 본문에 실린 기사를 다룬 기사로 기록합니다.
+
+    기사는 발송에 성공한 뒤에만 기록하므로 중간에 실패한 실행의 기사는 다음
+    실행에서 다시 후보가 됩니다. 기록에 실패해도 발송 결과는 그대로 반환합니다.
+    """
+    result = call_mcp("send_email", to=recipient, subject=subject, body=body)
+    links = _LINK_RE.findall(body)
+    if isinstance(result, str) and result.startswith("✅") and links:
+        try:
+            call_mcp("mark_seen", encoding="structured", links=list(dict.fromkeys(links)))
+        except Exception:
+            pass
+    return result
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from newsletter_artifacts import ArtifactStore, find_ref, mentions_ref
+
+HTML = "<!DOCTYPE html><html><body><h1>뉴스레터</h1></body></html>"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "artifacts")
+
+
+def test_resolve_exact_ref_and_handle(store):
+    artifact = store.put(HTML)
+
+    assert store.resolve(artifact.ref) == HTML
+    assert store.resolve(f"  {artifact.ref}\n") == HTML
+    assert store.resolve(artifact.handle()) == HTML
+    assert store.resolve(json.dumps(json.loads(artifact.handle()), indent=2)) == HTML
+
+
+def test_resolve_leaves_text_that_only_mentions_a_ref(store):
+    artifact = store.put(HTML)
+    texts = [
+        f"안녕하세요, 오늘의 뉴스레터는 {artifact.ref} 입니다.",
+        f"body: {artifact.ref}",
+        f'"{artifact.ref}"',
+        f'{{"artifact": "{artifact.ref}"}} 를 보냅니다',
+        '{"artifact": 3}',
+        "{not json",
+        "평범한 본문",
+    ]
+    for text in texts:
+        assert store.resolve(text) == text
+
+
+def test_find_ref_rejects_malformed_ids():
+    assert find_ref("artifact:0123456789abcdef") == "0123456789abcdef"
+    assert find_ref("artifact:0123456789ABCDEF") is None
+    assert find_ref("artifact:0123456789abcdef0") is None
+    assert find_ref(None) is None
+
+
+def test_mentions_ref_flags_refs_mixed_into_text():
+    ref = "artifact:0123456789abcdef"
+
+    assert mentions_ref(f"오늘의 뉴스레터는 {ref} 입니다.")
+    assert mentions_ref(f'{{"artifact": "{ref}"}} 를 보냅니다')
+    assert mentions_ref(ref)
+    assert not mentions_ref("<html>평범한 본문</html>")
+    assert not mentions_ref(None)
+
+
+def test_get_reloads_from_disk_and_verifies_hash(store, tmp_path):
+    artifact = store.put(HTML)
+    fresh = ArtifactStore(tmp_path / "artifacts")
+    assert fresh.resolve(artifact.ref) == HTML
+
+    path = tmp_path / "artifacts" / f"{artifact.id}.json"
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(json.dumps({**stored, "content": HTML + "변조"}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        ArtifactStore(tmp_path / "artifacts").get(artifact.id)
+
+
+def test_unknown_ref_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.resolve("artifact:ffffffffffffffff")
@@ -0,0 +1,47 @@
+from newsletter_article import Article
+from newsletter_dedupe import cluster_items, item_signature, similarity
+
+WORDS = [f"word{i}" for i in range(80)]
+
+
+def _article(title: str, link: str, summary: str = "", source: str = "feed") -> Article:
+    return Article(title, link, summary, source=source)
+
+
+def test_near_duplicates_merge_into_first_item():
+    title = "OpenAI releases a new reasoning model for developers"
+    summary = "OpenAI released a new reasoning model for developers on Tuesday"
+    items = [_article(title, f"https://site{i}.com/story", summary, source=f"feed{i}") for i in range(3)]
+
+    clusters = cluster_items(items)
+
+    assert len(clusters) == 1
+    assert clusters[0] is items[0]
+    assert [s["source"] for s in clusters[0].sources] == ["feed0", "feed1", "feed2"]
+    assert clusters[0].signature is not None
+
+
+def test_unrelated_items_stay_separate():
+    items = [
+        _article("Nvidia posts record quarterly revenue on AI chip demand", "https://a.com/1"),
+        _article("EU lawmakers agree on new rules for app store payments", "https://b.com/2"),
+        _article("Rust 2.0 roadmap proposes async traits everywhere", "https://c.com/3"),
+    ]
+
+    assert len(cluster_items(items)) == 3
+
+
+def test_chained_items_do_not_collapse_into_one_cluster():
+    # 이웃끼리는 비슷하지만 양 끝은 전혀 다른 기사들 (단일 연결 사슬)
+    items = [_article(" ".join(WORDS[i * 5:i * 5 + 20]), f"https://x.com/{i}") for i in range(9)]
+    first, last = item_signature(items[0]), item_signature(items[-1])
+    assert similarity(first, last) == 0.0
+    assert similarity(first, item_signature(items[1])) >= 0.5
+
+    clusters = cluster_items(items)
+
+    assert len(clusters) > 1
+    for cluster in clusters:
+        members = [item for item in items if any(s["link"] == item.link for s in cluster.sources)]
+        # 묶음의 모든 항목은 대표와 비슷해야 합니다.
+        assert all(similarity(cluster.signature, item_signature(item)) >= 0.5 for item in members)
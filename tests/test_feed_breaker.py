@@ -0,0 +1,170 @@
+import pytest
+
+import newsletter_feeds
+from newsletter_article import Article
+from newsletter_feeds import Feed, FeedCircuitBreaker, FeedHTTPCache, fetch_feeds
+
+URL = "https://example.com/feed.xml"
+DAY = 24 * 3600
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(newsletter_feeds.time, "time", clock)
+    return clock
+
+
+def _breaker(tmp_path, **kwargs):
+    return FeedCircuitBreaker(tmp_path / "feed_health.json", threshold=2, backoff_base=DAY, backoff_max=4 * DAY, **kwargs)
+
+
+def test_opens_after_threshold_consecutive_failures(tmp_path, clock):
+    breaker = _breaker(tmp_path)
+
+    breaker.record_failure(URL, "timeout")
+    assert breaker.allow(URL)
+    assert breaker.retry_at(URL) is None
+
+    breaker.record_failure(URL, "timeout")
+    assert not breaker.allow(URL)
+    assert breaker.retry_at(URL) == clock.now + DAY
+
+
+def test_half_open_allows_a_single_probe(tmp_path, clock):
+    breaker = _breaker(tmp_path)
+    breaker.record_failure(URL, "timeout")
+    breaker.record_failure(URL, "timeout")
+
+    clock.now += DAY
+    assert breaker.allow(URL)
+    assert not breaker.allow(URL)
+
+
+def test_successful_probe_closes_the_circuit(tmp_path, clock):
+    breaker = _breaker(tmp_path)
+    breaker.record_failure(URL, "timeout")
+    breaker.record_failure(URL, "timeout")
+    clock.now += DAY
+    assert breaker.allow(URL)
+
+    breaker.record_success(URL)
+
+    assert breaker.snapshot() == {}
+    assert breaker.allow(URL)
+    breaker.record_failure(URL, "timeout")
+    assert breaker.allow(URL)
+
+
+def test_failed_probe_doubles_backoff_up_to_max(tmp_path, clock):
+    breaker = _breaker(tmp_path)
+    breaker.record_failure(URL, "timeout")
+    breaker.record_failure(URL, "timeout")
+
+    waits = []
+    for _ in range(4):
+        clock.now = breaker.retry_at(URL)
+        assert breaker.allow(URL)
+        breaker.record_failure(URL, "timeout")
+        waits.append(breaker.retry_at(URL) - clock.now)
+
+    assert waits == [2 * DAY, 4 * DAY, 4 * DAY, 4 * DAY]
+
+
+def test_state_persists_across_instances(tmp_path, clock):
+    breaker = _breaker(tmp_path)
+    breaker.record_failure(URL, "HTTP 503")
+    breaker.record_failure(URL, "HTTP 503")
+
+    reloaded = _breaker(tmp_path)
+
+    assert not reloaded.allow(URL)
+    assert reloaded.snapshot()[URL]["last_error"] == "HTTP 503"
+
+
+def test_default_backoff_outlasts_a_daily_run_interval():
+    # 매일 실행할 때 열린 회로가 다음 실행 전에 풀리지 않아야 합니다.
+    assert newsletter_feeds.FEED_BACKOFF_BASE >= newsletter_feeds.FEED_RUN_INTERVAL
+    assert newsletter_feeds.FEED_BACKOFF_MAX >= newsletter_feeds.FEED_BACKOFF_BASE
+
+
+def test_default_backoff_max_does_not_outlive_stale_fallback():
+    assert newsletter_feeds.FEED_BACKOFF_MAX <= newsletter_feeds.FEED_STALE_MAX_AGE
+
+
+def test_force_probe_allows_one_caller(tmp_path, clock):
+    breaker = _breaker(tmp_path)
+    breaker.record_failure(URL, "timeout")
+    breaker.record_failure(URL, "timeout")
+
+    assert breaker.force_probe(URL)
+    assert not breaker.force_probe(URL)
+    breaker.record_success(URL)
+    assert breaker.allow(URL)
+
+
+class Fetcher:
+    def __init__(self, fail: bool) -> None:
+        self.fail = fail
+        self.calls: list[Feed] = []
+
+    def __call__(self, feed, limit, cache):
+        self.calls.append(feed)
+        if self.fail:
+            raise ConnectionError("down")
+        return [Article("Recovered story", "https://example.com/1", source=feed.name)]
+
+
+def _open_breaker(tmp_path):
+    breaker = _breaker(tmp_path)
+    breaker.record_failure(URL, "timeout")
+    breaker.record_failure(URL, "timeout")
+    return breaker
+
+
+def test_open_circuit_without_stale_items_probes_with_short_timeout(tmp_path, clock, monkeypatch):
+    fetcher = Fetcher(fail=False)
+    monkeypatch.setattr(newsletter_feeds, "fetch_feed", fetcher)
+    breaker = _open_breaker(tmp_path)
+
+    items, errors = fetch_feeds(
+        [Feed("feed", URL, timeout=15)], 5, cache=FeedHTTPCache(tmp_path / "feeds"), breaker=breaker
+    )
+
+    assert [item.title for item in items] == ["Recovered story"]
+    assert errors == {}
+    assert fetcher.calls[0].timeout == newsletter_feeds.FEED_PROBE_TIMEOUT
+    assert breaker.snapshot() == {}
+
+
+def test_open_circuit_with_stale_items_serves_them_without_request(tmp_path, clock, monkeypatch):
+    fetcher = Fetcher(fail=False)
+    monkeypatch.setattr(newsletter_feeds, "fetch_feed", fetcher)
+    cache = FeedHTTPCache(tmp_path / "feeds")
+    cache.store(URL, {}, b"", [Article("Old story", "https://example.com/0")], complete=True)
+    breaker = _open_breaker(tmp_path)
+
+    items, errors = fetch_feeds([Feed("feed", URL)], 5, cache=cache, breaker=breaker)
+
+    assert fetcher.calls == []
+    assert [(item.title, item.stale) for item in items] == [("Old story", True)]
+    assert "쉬는 중" in errors["feed"]
+
+
+def test_failed_forced_probe_keeps_circuit_open(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(newsletter_feeds, "fetch_feed", Fetcher(fail=True))
+    breaker = _open_breaker(tmp_path)
+
+    items, errors = fetch_feeds([Feed("feed", URL)], 5, cache=FeedHTTPCache(tmp_path / "feeds"), breaker=breaker)
+
+    assert items == []
+    assert errors["feed"] == "down"
+    assert breaker.retry_at(URL) == clock.now + 2 * DAY
@@ -0,0 +1,106 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from newsletter_feeds import STREAM_CHUNK_SIZE, Feed, FeedHTTPCache, fetch_feed, parse_feed_prefix
+
+ETAG = '"v1"'
+
+
+def _rss(count: int) -> bytes:
+    padding = "x" * 900
+    items = "".join(
+        f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+        f"<description>{padding}</description></item>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+
+BODY = _rss(80)
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    requests: list[tuple[str | None, int]] = []
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.requests.append((ETAG, 304))
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.requests.append((None, 200))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed():
+    FeedHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield Feed("fixture", f"http://127.0.0.1:{server.server_address[1]}/feed.xml", timeout=5)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeedHTTPCache(tmp_path / "feeds")
+
+
+def test_early_stop_caches_only_a_prefix(feed, cache):
+    items = fetch_feed(feed, 5, cache)
+
+    assert [item.title for item in items] == [f"Story {i}" for i in range(5)]
+    meta = cache.load(feed.url)
+    assert meta["complete"] is False
+    assert len(cache.body(feed.url)) < len(BODY)
+
+
+def test_not_modified_with_same_limit_uses_cached_items(feed, cache):
+    fetch_feed(feed, 5, cache)
+
+    items = fetch_feed(feed, 5, cache)
+
+    assert [item.title for item in items] == [f"Story {i}" for i in range(5)]
+    assert FeedHandler.requests == [(None, 200), (ETAG, 304)]
+
+
+def test_not_modified_with_larger_limit_refetches_full_body(feed, cache):
+    fetch_feed(feed, 5, cache)
+
+    items = fetch_feed(feed, 40, cache)
+
+    assert [item.title for item in items] == [f"Story {i}" for i in range(40)]
+    assert FeedHandler.requests == [(None, 200), (ETAG, 304), (None, 200)]
+
+
+def test_not_modified_with_limit_inside_cached_prefix_parses_body(feed, cache):
+    fetch_feed(feed, 5, cache)
+    in_prefix = len(parse_feed_prefix(cache.body(feed.url), feed.name, 1000))
+    assert 5 < in_prefix
+
+    items = fetch_feed(feed, in_prefix, cache)
+
+    assert len(items) == in_prefix
+    assert FeedHandler.requests == [(None, 200), (ETAG, 304)]
+
+
+def test_parse_feed_prefix_tolerates_truncation():
+    prefix = BODY[:STREAM_CHUNK_SIZE]
+
+    items = parse_feed_prefix(prefix, "fixture", 1000)
+
+    assert 0 < len(items) < 80
+    assert [item.title for item in items] == [f"Story {i}" for i in range(len(items))]
@@ -0,0 +1,84 @@
+import os
+import time
+
+import pytest
+
+from newsletter_llm_cache import CompletionCache, ReplayMissError
+
+NEWS = {"count": 5}
+
+
+def test_key_ignores_dict_order_and_separates_kinds():
+    a = CompletionCache.key("completion", {"model": "m", "messages": [{"role": "user", "content": "x"}]})
+    b = CompletionCache.key("completion", {"messages": [{"content": "x", "role": "user"}], "model": "m"})
+    assert a == b
+    assert a != CompletionCache.key("tool", {"model": "m", "messages": [{"role": "user", "content": "x"}]})
+
+
+def test_rw_resume_replays_side_effect_free_tools_only(tmp_path):
+    cache = CompletionCache(tmp_path, "rw")
+    run = cache.begin_run({"email": "a@example.com"})
+    assert cache.replay("fetch_tech_news", NEWS, "structured") == (False, None)
+    cache.record("fetch_tech_news", NEWS, "structured", {"articles": []})
+    cache.record("send_email", {"to": "a"}, None, "❌ 이메일 발송 실패: timeout")
+
+    resumed = CompletionCache(tmp_path, "rw")
+    resumed.resume_run(resumed.last_run())
+
+    assert resumed.replay("fetch_tech_news", NEWS, "structured") == (True, {"articles": []})
+    assert resumed.replay("send_email", {"to": "a"}, None) == (False, None)
+    assert resumed.replay("mark_seen", {"links": []}, None) == (False, None)
+    assert resumed.last_run()["run_id"] == run["run_id"]
+
+
+def test_new_run_does_not_see_previous_tool_results(tmp_path):
+    cache = CompletionCache(tmp_path, "rw")
+    cache.begin_run({})
+    cache.record("fetch_tech_news", NEWS, None, "old news")
+
+    cache.begin_run({})
+
+    assert cache.replay("fetch_tech_news", NEWS, None) == (False, None)
+
+
+def test_successful_send_completes_the_run(tmp_path):
+    cache = CompletionCache(tmp_path, "rw")
+    cache.begin_run({})
+    cache.record("send_email", {"to": "a"}, None, "❌ 실패")
+    assert cache.last_run()["completed"] is False
+
+    cache.record("send_email", {"to": "a"}, None, "✅ 이메일이 성공적으로 발송되었습니다: a")
+
+    assert cache.last_run()["completed"] is True
+
+
+def test_replay_mode_replays_every_tool_and_raises_on_miss(tmp_path):
+    recorder = CompletionCache(tmp_path, "record")
+    run = recorder.begin_run({})
+    recorder.record("send_email", {"to": "a"}, None, "✅ 발송")
+
+    replayer = CompletionCache(tmp_path, "replay")
+    replayer.resume_run(run)
+
+    assert replayer.replay("send_email", {"to": "a"}, None) == (True, "✅ 발송")
+    with pytest.raises(ReplayMissError):
+        replayer.replay("fetch_tech_news", NEWS, None)
+
+
+def test_prune_drops_expired_then_oldest_entries(tmp_path):
+    cache = CompletionCache(tmp_path, "rw", ttl=3600, max_bytes=10**9)
+    keys = [cache.key("completion", {"i": i}) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.store(key, {"i": i}, "x" * 100)
+        path = cache._path(key)
+        os.utime(path, (time.time() - (4 - i) * 1000,) * 2)
+    os.utime(cache._path(keys[0]), (time.time() - 7200,) * 2)
+    cache.begin_run({})
+
+    assert cache.prune() == 1
+    assert cache.lookup(keys[0]) == (False, None)
+
+    cache.max_bytes = cache._path(keys[3]).stat().st_size
+    assert cache.prune() == 2
+    assert [cache.lookup(key)[0] for key in keys] == [False, False, False, True]
+    assert cache.last_run() is not None
@@ -0,0 +1,20 @@
+import json
+
+from newsletter_metrics import payload_size
+from newsletter_server import NewsArticle, NewsDigest
+
+
+def test_payload_size_counts_serialized_json_not_repr():
+    digest = NewsDigest(
+        articles=[NewsArticle(title="제목", link="https://a.com/1", summary="요약", source="a", hash="h")],
+        text="",
+    )
+
+    assert payload_size(digest) == len(digest.model_dump_json().encode("utf-8"))
+    assert payload_size(digest) != len(str(digest).encode("utf-8"))
+
+
+def test_payload_size_of_plain_values():
+    assert payload_size("가나") == 6
+    assert payload_size(b"abc") == 3
+    assert payload_size({"a": [1, 2]}) == len(json.dumps({"a": [1, 2]}, separators=(",", ":")))
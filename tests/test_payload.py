@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+import newsletter_client
+from newsletter_client import PAYLOAD_STATS, TRUNCATION_MARKER, _encode_and_account, account_payload
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    monkeypatch.setenv("MCP_RESULT_MAX_CHARS", "10")
+    PAYLOAD_STATS.reset()
+    yield PAYLOAD_STATS
+    PAYLOAD_STATS.reset()
+
+
+def test_structured_results_are_not_counted(stats):
+    digest = {"articles": [{"title": "x" * 100}]}
+
+    result = SimpleNamespace(structured_content=digest, content=[])
+
+    encoded, size = _encode_and_account("fetch_tech_news", result, "structured")
+
+    assert encoded == digest
+    assert size > 10
+    assert stats.summary() == {}
+
+    _encode_and_account("fetch_tech_news", result, "compact")
+    assert stats.summary()["fetch_tech_news"]["truncated"] == 1
+
+
+def test_account_payload_truncates_and_records_the_rendered_text(stats):
+    text = account_payload("fetch_tech_news", "가" * 30)
+
+    assert text == "가" * 10 + TRUNCATION_MARKER.format(omitted=20)
+    [record] = stats.recent()
+    assert (record.tool, record.encoding, record.truncated) == ("fetch_tech_news", "rendered", True)
+    assert record.bytes == len(text.encode("utf-8"))
+    assert record.tokens == newsletter_client.estimate_tokens(text)
+
+
+def test_account_payload_can_skip_truncation(stats):
+    handle = '{"artifact":"artifact:0123456789abcdef"}'
+
+    assert account_payload("create_newsletter_html", handle, truncate=False) == handle
+    assert stats.summary()["create_newsletter_html"]["truncated"] == 0
@@ -0,0 +1,96 @@
+import pytest
+
+import newsletter_client
+import newsletter_server
+from newsletter_article import Article
+from newsletter_llm_cache import CompletionCache
+from newsletter_store import ArticleStore
+
+ITEMS = [
+    ("Chip maker unveils faster AI accelerator", "https://a.com/chips?utm_source=rss", "New accelerator."),
+    ("Browser vendor ships new privacy sandbox", "https://b.com/privacy", "Privacy changes."),
+]
+
+
+class Stores:
+    def __init__(self, path):
+        self.path = path
+        self.current = ArticleStore(path)
+
+    def restart(self):
+        self.current.close()
+        self.current = ArticleStore(self.path)
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    stores = Stores(tmp_path / "articles.sqlite3")
+    monkeypatch.setattr(newsletter_server, "get_store", lambda: stores.current)
+    monkeypatch.setattr(newsletter_server, "load_feeds", lambda: [])
+    monkeypatch.setattr(
+        newsletter_server, "fetch_feeds", lambda feeds, limit: ([Article(*item) for item in ITEMS], {})
+    )
+    yield stores
+    stores.current.close()
+
+
+def _fetch(**kwargs):
+    return newsletter_server.fetch_tech_news.fn(count=2, rank=False, **kwargs)
+
+
+def _unseen_links():
+    return [article.link for article in _fetch(only_unseen=True).articles]
+
+
+def test_fetch_does_not_mark_articles_seen(stores):
+    assert len(_fetch().articles) == 2
+    # 발송하지 못한 실행 뒤에도 같은 기사가 다시 후보가 됩니다.
+    assert len(_unseen_links()) == 2
+
+
+def test_mark_seen_records_only_sent_articles(stores):
+    _fetch()
+
+    result = newsletter_server.mark_seen.fn(links=["http://www.a.com/chips/", "https://unknown.com/x"])
+
+    assert result.startswith("✅ 1개")
+    assert _unseen_links() == ["https://b.com/privacy"]
+
+
+def test_mark_seen_ignores_links_it_did_not_return(stores):
+    result = newsletter_server.mark_seen.fn(links=["https://a.com/chips"])
+
+    assert not result.startswith("✅")
+    assert len(_unseen_links()) == 2
+
+
+def test_mark_seen_survives_a_server_restart(stores):
+    _fetch()
+    stores.restart()
+
+    assert newsletter_server.mark_seen.fn(links=["https://a.com/chips", "https://b.com/privacy"]).startswith("✅ 2개")
+    assert _unseen_links() == []
+
+
+def test_mark_seen_after_rw_resume_from_the_tape(stores, tmp_path, monkeypatch):
+    arguments = {"encoding": "structured", "cache": False, "count": 2, "only_unseen": True, "rank": False}
+    tape = CompletionCache(tmp_path / "llm", "rw")
+    tape.begin_run({"email": "a@example.com"})
+    newsletter_client.set_tape(tape)
+    try:
+        first = newsletter_client.call_mcp("fetch_tech_news", **arguments)
+
+        # 서버를 다시 시작하고, 이어서 하는 실행은 뉴스 수집을 기록에서 꺼냅니다.
+        stores.restart()
+        monkeypatch.setattr(newsletter_server, "fetch_feeds", lambda feeds, limit: pytest.fail("tape not used"))
+        resumed = CompletionCache(tmp_path / "llm", "rw")
+        resumed.resume_run(resumed.last_run())
+        newsletter_client.set_tape(resumed)
+        assert newsletter_client.call_mcp("fetch_tech_news", **arguments) == first
+
+        links = [article["link"] for article in first["articles"]]
+        assert newsletter_client.call_mcp("mark_seen", links=links).startswith("✅ 2개")
+    finally:
+        newsletter_client.set_tape(None)
+
+    assert [new for _, new in stores.current.classify([Article(*item) for item in ITEMS])] == [False, False]
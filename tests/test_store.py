@@ -0,0 +1,56 @@
+import pytest
+
+from newsletter_article import Article
+from newsletter_store import ArticleStore, canonicalize_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://example.com/a", "https://example.com/a"),
+        ("http://www.Example.com/a/", "https://example.com/a"),
+        ("https://example.com:443//a//b/", "https://example.com/a/b"),
+        ("https://example.com:8080/a", "https://example.com:8080/a"),
+        ("https://example.com/a?utm_source=x&b=2&a=1&fbclid=z", "https://example.com/a?a=1&b=2"),
+        ("https://example.com/a?UTM_Medium=x#comments", "https://example.com/a"),
+        ("  https://example.com  ", "https://example.com/"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_tracking_variants_share_one_canonical_url():
+    variants = [
+        "https://www.example.com/story?utm_campaign=feed",
+        "http://example.com/story/",
+        "https://example.com/story#top",
+        "https://example.com/story?ref=rss",
+    ]
+    assert len({canonicalize_url(url) for url in variants}) == 1
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+    yield store
+    store.close()
+
+
+def test_classify_does_not_record_until_mark_seen(store):
+    article = Article("Title", "https://example.com/a?utm_source=rss", "summary")
+
+    assert store.classify([article]) == [(article, True)]
+    assert store.classify([article]) == [(article, True)]
+
+    store.mark_seen([article])
+
+    same_story = Article("Title", "http://www.example.com/a/", "summary")
+    assert store.classify([same_story]) == [(same_story, False)]
+
+
+def test_classify_matches_content_hash_across_urls(store):
+    store.mark_seen([Article("Same title", "https://a.com/1", "Same summary")])
+
+    moved = Article("Same  TITLE", "https://b.com/2", "<p>same summary</p>")
+    assert store.classify([moved]) == [(moved, False)]
@@ -0,0 +1,34 @@
+from newsletter_text import html_to_text, summarize_html, truncate_words
+
+
+def test_summarize_does_not_end_on_a_dangling_connector():
+    fragment = "<p>Hello&nbsp;world &amp; friends</p><p>xxxxxxxxxx</p>"
+
+    assert summarize_html(fragment, 20) == "Hello world..."
+
+
+def test_truncate_strips_trailing_punctuation_and_connectors():
+    assert truncate_words("alpha beta / gamma delta", 12) == "alpha beta..."
+    assert truncate_words("alpha beta — gamma delta", 12) == "alpha beta..."
+    assert truncate_words("alpha beta, gamma delta", 11) == "alpha beta..."
+    assert truncate_words("short", 20) == "short"
+
+
+def test_truncate_falls_back_to_a_hard_cut_without_a_late_boundary():
+    assert truncate_words("a " + "x" * 30, 10) == "a xxxxxxxx..."
+
+
+def test_html_to_text_drops_hidden_content_and_unescapes_entities():
+    fragment = "<script>alert(1)</script><p>Tom&#8217;s&nbsp;<b>news</b></p><!-- note -->"
+
+    assert html_to_text(fragment) == "Tom’s news"
+
+
+def test_summarize_long_fragment_keeps_entities_whole():
+    fragment = "<p>" + "word " * 100 + "&amp; tail</p>"
+
+    summary = summarize_html(fragment, 50)
+
+    assert summary.endswith("word...")
+    assert len(summary) <= 50 + 3
+    assert "&amp" not in summary